@@ -1,18 +1,66 @@
 from __future__ import annotations
 
+import atexit
+import os
+
 from flask import Flask, jsonify, redirect, render_template, request, url_for
 
 from services import (
+    ValidationError,
     cancel_order,
     complete_order,
     confirm_order,
     create_order_draft,
+    create_supplier_po,
+    find_orders_by_ref,
     get_delivery_order,
+    get_order_stats,
+    get_supplier,
+    get_supplier_po,
+    link_supplier_po,
     list_orders,
+    list_supplier_pos_for_order,
+    query_orders,
+    receive_supplier_po,
+    search_orders,
+)
+from services.admin_service import (
+    cache_status,
+    reload_table,
+    storage_health,
+    table_status,
+)
+from services.order_refs_service import load_job_orders, pending_list_migration
+from services.print_service import render_delivery_orders
+from compression import init_compression
+from db import (
+    CLIENT_MASTER_FILE,
+    ITEM_MASTER_FILE,
+    load_snapshot,
+    normalize_columns,
+    read_table,
+    save_snapshot,
 )
-from db import CLIENT_MASTER_FILE, ITEM_MASTER_FILE, normalize_columns, read_table
+from idempotency import idempotent, init_idempotency
+from json_provider import FastJSONProvider
+from records import Status
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+init_compression(app)
+init_idempotency(app)
+# Warm start: reuse indexes from the last run whose source files are unchanged.
+# CACHE_SNAPSHOT=0 starts cold and leaves the snapshot file alone.
+if os.environ.get("CACHE_SNAPSHOT", "1") != "0":
+    load_snapshot()
+    atexit.register(save_snapshot)
+# Migrating rewrites workbooks, so it is an explicit step, never an import-time
+# side effect; until it has run, PO/supplier DO lists read as empty.
+if pending := pending_list_migration():
+    app.logger.warning(
+        "Legacy list columns in %s; run `python main.py migrate-list-fields`",
+        ", ".join(pending),
+    )
 
 
 @app.get("/")
@@ -30,6 +78,24 @@ def create_order_page():
     return render_template("create_order.html")
 
 
+@app.get("/delivery/print")
+def delivery_print_page():
+    do_numbers = [
+        number.strip()
+        for value in request.args.getlist("do")
+        for number in value.split(",")
+        if number.strip()
+    ]
+    sheets, missing = render_delivery_orders(
+        do_numbers, lambda do: render_template("delivery_order_sheet.html", do=do)
+    )
+    status = 200 if sheets or not missing else 404
+    return (
+        render_template("delivery_order_print.html", sheets=sheets, missing=missing),
+        status,
+    )
+
+
 @app.get("/delivery/<do_number>")
 def delivery_page(do_number: str):
     return render_template("delivery_order_client.html", do_number=do_number)
@@ -45,17 +111,63 @@ def api_list_orders():
     return jsonify(list_orders(filters))
 
 
+QUERY_FILTERS = (
+    "issue_from",
+    "issue_to",
+    "required_from",
+    "required_to",
+    "client_code",
+    "local_export",
+    "overdue",
+)
+
+
+@app.get("/api/orders/query")
+def api_query_orders():
+    filters = {name: request.args.get(name) for name in QUERY_FILTERS}
+    filters["status"] = request.args.getlist("status")
+    limit = request.args.get("limit")
+    try:
+        limit = int(limit) if limit else None
+    except ValueError:
+        return jsonify({"ok": False, "error": "limit must be an integer"}), 400
+    try:
+        rows, plan = query_orders(filters, limit=limit)
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 400
+    response = jsonify({"ok": True, "data": rows})
+    response.headers["X-Query-Plan"] = plan
+    return response
+
+
+@app.get("/api/orders/by-client-po/<po_number>")
+def api_orders_by_client_po(po_number: str):
+    return jsonify({"ok": True, "data": find_orders_by_ref(po_number)})
+
+
 @app.post("/api/orders")
+@idempotent()
 def api_create_order():
     payload = request.get_json(force=True, silent=True) or {}
     try:
         result = create_order_draft(payload)
         return jsonify({"ok": True, "data": result})
+    except ValidationError as exc:
+        return jsonify({"ok": False, "error": str(exc), "errors": exc.errors}), 400
     except ValueError as exc:
         return jsonify({"ok": False, "error": str(exc)}), 400
 
 
+def _confirmed_key(jo_number: str) -> str | None:
+    """Confirming a Delivering JO again replays its original confirmation."""
+    order = load_job_orders().get(jo_number)
+    if order is None or order.status != Status.DELIVERING:
+        return None
+    return f"confirm:{jo_number}"
+
+
 @app.post("/api/orders/<jo_number>/confirm")
+@idempotent(natural_key=_confirmed_key)
 def api_confirm_order(jo_number: str):
     try:
         result = confirm_order(jo_number)
@@ -65,6 +177,7 @@ def api_confirm_order(jo_number: str):
 
 
 @app.post("/api/orders/<jo_number>/complete")
+@idempotent()
 def api_complete_order(jo_number: str):
     try:
         result = complete_order(jo_number)
@@ -74,6 +187,7 @@ def api_complete_order(jo_number: str):
 
 
 @app.post("/api/orders/<jo_number>/cancel")
+@idempotent()
 def api_cancel_order(jo_number: str):
     try:
         result = cancel_order(jo_number)
@@ -91,6 +205,101 @@ def api_get_delivery(do_number: str):
         return jsonify({"ok": False, "error": str(exc)}), 400
 
 
+@app.get("/api/search")
+def api_search():
+    query = request.args.get("q", "")
+    try:
+        limit = int(request.args.get("limit", 20))
+    except ValueError:
+        return jsonify({"ok": False, "error": "limit must be an integer"}), 400
+    return jsonify({"ok": True, "data": search_orders(query, limit=limit)})
+
+
+@app.get("/api/stats")
+def api_stats():
+    rebuild = request.args.get("rebuild") in ("1", "true")
+    return jsonify({"ok": True, "data": get_order_stats(rebuild=rebuild)})
+
+
+@app.get("/api/orders/<jo_number>/supplier-pos")
+def api_order_supplier_pos(jo_number: str):
+    return jsonify({"ok": True, "data": list_supplier_pos_for_order(jo_number)})
+
+
+@app.get("/api/suppliers/<supplier_code>")
+def api_get_supplier(supplier_code: str):
+    try:
+        return jsonify({"ok": True, "data": get_supplier(supplier_code)})
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 404
+
+
+@app.post("/api/suppliers/po")
+@idempotent()
+def api_create_supplier_po():
+    payload = request.get_json(force=True, silent=True) or {}
+    try:
+        result = create_supplier_po(payload)
+        return jsonify({"ok": True, "data": result})
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 400
+
+
+@app.get("/api/suppliers/po/<po_number>")
+def api_get_supplier_po(po_number: str):
+    try:
+        result = get_supplier_po(po_number)
+        return jsonify({"ok": True, "data": result})
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 400
+
+
+@app.post("/api/suppliers/po/<po_number>/receive")
+@idempotent()
+def api_receive_supplier_po(po_number: str):
+    payload = request.get_json(force=True, silent=True) or {}
+    try:
+        result = receive_supplier_po(po_number, payload.get("items"))
+        return jsonify({"ok": True, "data": result})
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 400
+
+
+@app.post("/api/suppliers/po/<po_number>/link")
+@idempotent()
+def api_link_supplier_po(po_number: str):
+    payload = request.get_json(force=True, silent=True) or {}
+    try:
+        result = link_supplier_po(po_number, payload.get("jo_number"))
+        return jsonify({"ok": True, "data": result})
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 400
+
+
+@app.get("/healthz")
+def healthz():
+    health = storage_health()
+    return jsonify(health), 200 if health["ok"] else 503
+
+
+@app.get("/api/admin/tables")
+def api_admin_tables():
+    return jsonify({"ok": True, "data": table_status()})
+
+
+@app.get("/api/admin/cache")
+def api_admin_cache():
+    return jsonify({"ok": True, "data": cache_status()})
+
+
+@app.post("/api/admin/tables/<table>/reload")
+def api_admin_reload_table(table: str):
+    try:
+        return jsonify({"ok": True, "data": reload_table(table)})
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 404
+
+
 @app.get("/api/clients/<client_code>")
 def api_get_client(client_code: str):
     df = read_table(CLIENT_MASTER_FILE)
@@ -0,0 +1,74 @@
+"""Time API response encoding for a list_orders-sized payload.
+
+Usage: python benchmarks/bench_json_encode.py [rows]
+
+Encodes ``rows`` dashboard rows (default 10000) with Flask's stdlib provider
+and with ``FastJSONProvider`` (orjson when installed), then gzip/br sizes.
+"""
+
+from __future__ import annotations
+
+import gzip
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import json_provider  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _rows(count: int) -> list[dict[str, object]]:
+    return [
+        {
+            "issue_date": "2026-02-05",
+            "jo_number": f"JO26-{idx:05d}",
+            "client_po_list": f"PO{idx:07d}, PO{idx + 1:07d}",
+            "client_name": f"Client {idx % 200:03d} Pte Ltd",
+            "required_date": "2026-02-19",
+            "do_to_supplier_first": "",
+            "do_client_number": f"DO26-{idx:05d}",
+            "status": "Delivering",
+            "complete_date": "",
+            "qty": np.int64(idx),
+        }
+        for idx in range(count)
+    ]
+
+
+def _time(label: str, func, repeat: int = 5) -> bytes:
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{label:<28} {best * 1000:9.1f} ms")
+    return func()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rows = _rows(count)
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+
+    print(f"{count} rows, orjson={'yes' if json_provider.orjson else 'no'}")
+    # The default provider cannot encode numpy ints, so it gets plain ints.
+    plain_rows = [{**row, "qty": int(row["qty"])} for row in rows]
+    _time("stdlib DefaultJSONProvider", lambda: stdlib.dumps(plain_rows).encode())
+    body = _time("FastJSONProvider encode", lambda: json_provider.encode(rows))
+    _time("gzip level 5", lambda: gzip.compress(body, compresslevel=5))
+    if brotli is not None:
+        _time("brotli quality 4", lambda: brotli.compress(body, quality=4))
+    print(
+        f"body {len(body) / 1024:.0f} KiB, gzip {len(gzip.compress(body, 5)) / 1024:.0f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare the memory held by a DataFrame-resident working set with records.
+
+Usage: python benchmarks/bench_records_memory.py [rows]
+
+Builds ``rows`` synthetic job order rows (default 500000) the way
+``read_table`` holds them (object-dtype DataFrame) and as ``records.JobOrder``
+instances, and reports traced allocations plus conversion time for each.
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd  # noqa: E402
+
+from records import JobOrder  # noqa: E402
+from services.order_service import JOB_ORDER_COLUMNS  # noqa: E402
+
+STATUSES = ["Preparing", "Delivering", "Completed", "Canceled"]
+
+
+def _rows(count: int) -> list[dict[str, object]]:
+    rows = []
+    for idx in range(count):
+        day = f"2026-{idx % 12 + 1:02d}-{idx % 28 + 1:02d}"
+        rows.append(
+            {
+                "id": f"jo-JO26-{idx:06d}",
+                "jo_number": f"JO26-{idx:06d}",
+                "issue_date": day,
+                "client_po_list": f'["PO{idx:07d}"]',
+                "client_code": f"C{idx % 200:03d}",
+                "client_name": f"Client {idx % 200:03d} Pte Ltd",
+                "required_date": day,
+                "local_export": "Local" if idx % 3 else "Export",
+                "remark": float("nan"),
+                "do_to_supplier_list": "[]",
+                "do_to_client_number": f"DO26-{idx:06d}",
+                "status": STATUSES[idx % 4],
+                "complete_date": float("nan"),
+                "created_at": f"{day}T10:00:00",
+                "updated_at": f"{day}T10:00:00",
+            }
+        )
+    return rows
+
+
+def _measure(label: str, build) -> None:
+    # Timed without tracing; tracemalloc slows allocation-heavy code a lot.
+    gc.collect()
+    started = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - started
+    del value
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    print(f"{label:<22} {current / 1024 / 1024:10.1f} MiB {elapsed:8.2f} s")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    # Each side re-creates the raw cells so strings are not shared between them.
+    print(f"{count} job order rows")
+    print(f"{'representation':<22} {'memory':>14} {'build':>10}")
+    _measure(
+        "DataFrame (object)",
+        lambda: pd.DataFrame(_rows(count), columns=JOB_ORDER_COLUMNS, dtype=object),
+    )
+    _measure("JobOrder records", lambda: [JobOrder.from_row(r) for r in _rows(count)])
+
+
+if __name__ == "__main__":
+    main()
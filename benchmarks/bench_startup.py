@@ -0,0 +1,125 @@
+"""Time-to-first-response of a fresh app process, cold vs warm start.
+
+Usage: python benchmarks/bench_startup.py [orders] [runs]
+
+Writes ``orders`` job orders (default 20000, 3 items each) to a temp dir,
+then starts new interpreters that import ``app`` and serve ``/api/orders``
+and ``/api/search``. "cold" runs with CACHE_SNAPSHOT=0; "warm" runs after
+``write_snapshot()`` has saved the indexes. Reports the best of ``runs``.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+import db  # noqa: E402
+from services.order_service import (  # noqa: E402
+    JOB_ORDER_COLUMNS,
+    JOB_ORDER_ITEM_COLUMNS,
+    JOB_ORDER_REF_COLUMNS,
+)
+
+# Runs in the child: point db at the temp tables before anything imports them.
+CHILD = """
+import sys, time
+start = time.perf_counter()
+from pathlib import Path
+sys.path.insert(0, {root!r})
+import db
+data = Path({data!r})
+for name in dir(db):
+    if name.endswith("_FILE"):
+        path = getattr(db, name)
+        setattr(db, name, data / path.parent.name / path.name)
+if {snapshot}:
+    from services.cache_service import write_snapshot
+    write_snapshot()
+    raise SystemExit
+import app
+client = app.app.test_client()
+assert client.get("/api/orders?year=2026").status_code == 200
+assert client.get("/api/search?q=client").status_code == 200
+done = time.perf_counter()
+print(done - start, "pandas" in sys.modules)
+"""
+
+
+def _seed(data: Path, orders: int) -> None:
+    (data / "data").mkdir(parents=True)
+    (data / "master").mkdir(parents=True)
+    jo_rows, item_rows, ref_rows = [], [], []
+    for idx in range(1, orders + 1):
+        jo = f"JO26-{idx:05d}"
+        day = f"2026-{idx % 12 + 1:02d}-{idx % 28 + 1:02d}"
+        jo_rows.append(
+            {
+                "id": f"jo-{jo}",
+                "jo_number": jo,
+                "issue_date": day,
+                "client_code": f"C{idx % 200:03d}",
+                "client_name": f"Client {idx % 200:03d} Pte Ltd",
+                "required_date": day,
+                "local_export": "Local",
+                "status": "Preparing",
+            }
+        )
+        ref_rows.append(
+            {"jo_number": jo, "ref_type": "client_po", "ref_value": f"PO{idx}"}
+        )
+        for line in range(1, 4):
+            item_rows.append(
+                {"jo_number": jo, "item_code": f"I{line:03d}", "qty": line}
+            )
+    tables = [
+        (db.JOB_ORDER_FILE, jo_rows, JOB_ORDER_COLUMNS),
+        (db.JOB_ORDER_ITEMS_FILE, item_rows, JOB_ORDER_ITEM_COLUMNS),
+        (db.JOB_ORDER_REFS_FILE, ref_rows, JOB_ORDER_REF_COLUMNS),
+    ]
+    for path, rows, columns in tables:
+        frame = pd.DataFrame(rows).reindex(columns=columns)
+        frame.to_excel(data / "data" / path.name, index=False)
+
+
+def _run(data: Path, cold: bool, snapshot: bool = False) -> tuple[float, bool]:
+    env = dict(os.environ, CACHE_SNAPSHOT="0" if cold else "1")
+    code = CHILD.format(root=str(ROOT), data=str(data), snapshot=snapshot)
+    started = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    if out.returncode:
+        raise SystemExit(out.stderr)
+    if snapshot:
+        return wall, True
+    _, pandas_loaded = out.stdout.split()
+    return wall, pandas_loaded == "True"
+
+
+def main() -> None:
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    with tempfile.TemporaryDirectory() as tmp:
+        data = Path(tmp)
+        _seed(data, orders)
+        print(f"{orders} job orders, {orders * 3} items; best of {runs}")
+        cold = min(_run(data, cold=True) for _ in range(runs))
+        print(f"cold: {cold[0]:.2f}s to first response (pandas loaded: {cold[1]})")
+        snap, _ = _run(data, cold=False, snapshot=True)
+        print(f"snapshot written in {snap:.2f}s")
+        warm = min(_run(data, cold=False) for _ in range(runs))
+        print(f"warm: {warm[0]:.2f}s to first response (pandas loaded: {warm[1]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Generate synthetic masters and order history for load and upgrade testing.
+
+Usage: python benchmarks/generate_data.py [--out DIR] [--years 3]
+       [--orders-per-year 800] [--clients 200] [--items 500] [--force]
+
+Writes ``master/client_master.xlsx`` and ``master/item_master.xlsx`` plus
+JO/DO/item/ref tables under ``data/`` in ``--out`` (default: a scratch
+directory, never the repo's own data unless ``--out .`` is given).
+
+Shape of the data:
+- Client popularity follows a Zipf curve, so a few clients place most orders.
+- Lines per order are exponential around ``--lines-mean``; export orders are
+  three times larger, capped at 400 lines.
+- Orders older than 60 days are closed (mostly Completed, some Canceled).
+  Recent ones spread over Preparing, Delivering, Completed and Canceled.
+- Delivering and Completed orders get a DO, numbered in DO-date order within
+  its year like ``confirm_order`` does. Completed DOs land around the
+  required date, late now and then.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+import db  # noqa: E402
+from services.order_service import (  # noqa: E402
+    DELIVERY_ORDER_COLUMNS,
+    DELIVERY_ORDER_ITEM_COLUMNS,
+    JOB_ORDER_COLUMNS,
+    JOB_ORDER_ITEM_COLUMNS,
+    JOB_ORDER_REF_COLUMNS,
+    REF_CLIENT_PO,
+    REF_SUPPLIER_DO,
+    build_ref_rows,
+)
+
+CLOSED_AFTER_DAYS = 60
+MAX_LINES = 400
+GLASS = ["Pyran S", "Wired Glass", "Laminated", "Tempered", "Low-E", "Fire Rated"]
+STREETS = ["Raffles Place", "Jurong West", "Tampines Ave", "Woodlands Dr", "Ubi Rd"]
+
+
+def _masters(rng: random.Random, clients: int, items: int) -> tuple[list, list]:
+    client_rows = [
+        {
+            "client_code": f"C{idx:04d}",
+            "client_name": f"Client {idx:04d} Pte Ltd",
+            "delivery_address": f"{rng.randint(1, 200)} {rng.choice(STREETS)}, "
+            f"Singapore {rng.randint(100000, 829999)}",
+            "client_pic": f"PIC {idx:04d}",
+            "client_contact": f"+65 {rng.randint(60000000, 99999999)}",
+        }
+        for idx in range(1, clients + 1)
+    ]
+    item_rows = [
+        {
+            "item_code": f"I{idx:05d}",
+            "item_description": f"{rng.choice(GLASS)} {rng.choice([5, 6, 8, 10, 12])}mm",
+        }
+        for idx in range(1, items + 1)
+    ]
+    return client_rows, item_rows
+
+
+def _status(rng: random.Random, age_days: int) -> str:
+    if age_days > CLOSED_AFTER_DAYS:
+        return "Completed" if rng.random() < 0.92 else "Canceled"
+    return rng.choices(
+        ["Preparing", "Delivering", "Completed", "Canceled"], [40, 35, 20, 5]
+    )[0]
+
+
+def generate(
+    out: Path,
+    years: int,
+    orders_per_year: int,
+    clients: int,
+    items: int,
+    lines_mean: float,
+    export_share: float,
+    seed: int,
+) -> dict[str, int]:
+    rng = random.Random(seed)
+    client_rows, item_rows = _masters(rng, clients, items)
+    weights = [1 / rank**1.1 for rank in range(1, clients + 1)]
+    today = date.today()
+    stamp = f"{today.isoformat()}T00:00:00"
+
+    orders: list[dict[str, Any]] = []
+    for year in range(today.year - years + 1, today.year + 1):
+        last = today if year == today.year else date(year, 12, 31)
+        span = (last - date(year, 1, 1)).days
+        count = orders_per_year * (span + 1) // 366 or 1
+        issued = sorted(
+            date(year, 1, 1) + timedelta(days=rng.randint(0, span))
+            for _ in range(count)
+        )
+        for seq, issue in enumerate(issued, start=1):
+            orders.append(
+                {"jo_number": f"JO{year % 100:02d}-{seq:03d}", "issue": issue}
+            )
+
+    jo_rows, jo_items, refs, deliveries = [], [], [], []
+    for order in orders:
+        jo_number, issue = order["jo_number"], order["issue"]
+        client = rng.choices(client_rows, weights)[0]
+        export = rng.random() < export_share
+        required = issue + timedelta(days=rng.randint(3, 30))
+        status = _status(rng, (today - issue).days)
+        complete = ""
+        if status == "Completed":
+            done = required + timedelta(days=round(rng.gauss(-1, 3)))
+            complete = min(max(done, issue), today).isoformat()
+        jo_rows.append(
+            {
+                "id": f"jo-{jo_number}",
+                "jo_number": jo_number,
+                "issue_date": issue.isoformat(),
+                "client_code": client["client_code"],
+                "client_name": client["client_name"],
+                "required_date": required.isoformat(),
+                "local_export": "Export" if export else "Local",
+                "remark": "",
+                "do_to_client_number": "",
+                "status": status,
+                "complete_date": complete,
+                "created_at": stamp,
+                "updated_at": stamp,
+            }
+        )
+        mean = lines_mean * (3 if export else 1)
+        lines = min(int(rng.expovariate(1 / mean)) + 1, MAX_LINES)
+        for line in range(1, lines + 1):
+            item = rng.choice(item_rows)
+            jo_items.append(
+                {
+                    "id": f"jo-{jo_number}-item-{line}",
+                    "jo_number": jo_number,
+                    "item_code": item["item_code"],
+                    "item_description": item["item_description"],
+                    "width": rng.randrange(300, 2400, 50),
+                    "length": rng.randrange(300, 3000, 50),
+                    "qty": rng.randint(1, 50),
+                    "created_at": stamp,
+                    "updated_at": stamp,
+                }
+            )
+        pos = [f"PO{rng.randint(1000000, 9999999)}" for _ in range(rng.randint(1, 2))]
+        refs += build_ref_rows(jo_number, REF_CLIENT_PO, pos, stamp)
+        if rng.random() < 0.3:
+            supplier_do = [f"SDO{rng.randint(10000, 99999)}"]
+            refs += build_ref_rows(jo_number, REF_SUPPLIER_DO, supplier_do, stamp)
+        if status in ("Delivering", "Completed"):
+            shipped = min(issue + timedelta(days=rng.randint(1, 5)), today)
+            deliveries.append((shipped, jo_rows[-1], client))
+
+    do_rows, do_items = [], []
+    deliveries.sort(key=lambda entry: (entry[0], entry[1]["jo_number"]))
+    items_by_jo: dict[str, list[dict[str, Any]]] = {}
+    for item in jo_items:
+        items_by_jo.setdefault(item["jo_number"], []).append(item)
+    counters: dict[int, int] = {}
+    for shipped, jo, client in deliveries:
+        counters[shipped.year] = counters.get(shipped.year, 0) + 1
+        do_number = f"DO{shipped.year % 100:02d}-{counters[shipped.year]:03d}"
+        jo["do_to_client_number"] = do_number
+        do_rows.append(
+            {
+                "id": f"do-{do_number}",
+                "do_client_number": do_number,
+                "issue_date": shipped.isoformat(),
+                "jo_number": jo["jo_number"],
+                "client_code": client["client_code"],
+                "client_name": client["client_name"],
+                "delivery_address": client["delivery_address"],
+                "client_pic": client["client_pic"],
+                "client_contact": client["client_contact"],
+                "remark": "",
+                "status": jo["status"],
+                "complete_date": jo["complete_date"],
+                "created_at": stamp,
+                "updated_at": stamp,
+            }
+        )
+        for idx, item in enumerate(items_by_jo[jo["jo_number"]], start=1):
+            do_items.append(
+                dict(item, id=f"do-{do_number}-item-{idx}", do_client_number=do_number)
+            )
+
+    tables = [
+        (db.CLIENT_MASTER_FILE, client_rows, list(client_rows[0])),
+        (db.ITEM_MASTER_FILE, item_rows, list(item_rows[0])),
+        (db.JOB_ORDER_FILE, jo_rows, JOB_ORDER_COLUMNS),
+        (db.JOB_ORDER_ITEMS_FILE, jo_items, JOB_ORDER_ITEM_COLUMNS),
+        (db.JOB_ORDER_REFS_FILE, refs, JOB_ORDER_REF_COLUMNS),
+        (db.DELIVERY_ORDER_FILE, do_rows, DELIVERY_ORDER_COLUMNS),
+        (db.DELIVERY_ORDER_ITEMS_FILE, do_items, DELIVERY_ORDER_ITEM_COLUMNS),
+    ]
+    counts = {}
+    for path, rows, columns in tables:
+        target = out / path.parent.name / path.name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(rows).reindex(columns=columns).to_excel(target, index=False)
+        counts[path.stem] = len(rows)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", type=Path, default=ROOT / "benchmarks" / "loaddata")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--orders-per-year", type=int, default=800)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--lines-mean", type=float, default=4.0)
+    parser.add_argument("--export-share", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--force", action="store_true", help="overwrite existing tables in --out"
+    )
+    args = parser.parse_args()
+
+    existing = [
+        p
+        for p in (args.out / "data" / db.JOB_ORDER_FILE.name, args.out / "master")
+        if p.exists() and (p.is_file() or any(p.iterdir()))
+    ]
+    if existing and not args.force:
+        raise SystemExit(f"{existing[0]} exists; pass --force to overwrite")
+    counts = generate(
+        args.out,
+        args.years,
+        args.orders_per_year,
+        args.clients,
+        args.items,
+        args.lines_mean,
+        args.export_share,
+        args.seed,
+    )
+    for table, rows in counts.items():
+        print(f"{table:>22}: {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""Replay a mix of API calls at increasing concurrency and report latency.
+
+Usage: python benchmarks/load_test.py [--data DIR | --url URL]
+       [--concurrency 1,4,16] [--requests 200] [--mix list=40,create=15,...]
+
+By default the app runs in-process (one Flask test client per thread) on the
+tables in ``--data``, e.g. the output of ``generate_data.py``. With ``--url``
+the driver sends real HTTP requests to a running ``app.py`` instead. Client
+and item codes for new orders come from the masters under ``--data``.
+
+Each level reports throughput, p50/p95/p99 latency per operation and overall,
+the error rate (HTTP >= 400 or ``ok: false``), and duplicate JO/DO numbers:
+numbers handed out by more than one create/confirm call.
+
+Writes go to the tables in ``--data``, so point it at a scratch copy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import db  # noqa: E402
+
+DEFAULT_MIX = "list=40,create=15,confirm=15,complete=8,cancel=2,delivery=20"
+
+
+def _point_db_at(data: Path) -> None:
+    """Redirect every table path before the services import them."""
+    for name in dir(db):
+        if name.endswith("_FILE"):
+            path = getattr(db, name)
+            setattr(db, name, data / path.parent.name / path.name)
+
+
+class HttpTransport:
+    def __init__(self, url: str) -> None:
+        self.url = url.rstrip("/")
+
+    def request(self, method: str, path: str, body: Any = None) -> tuple[int, Any]:
+        data = None if body is None else json.dumps(body).encode()
+        req = urllib.request.Request(
+            self.url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                return resp.status, json.loads(resp.read() or b"null")
+        except urllib.error.HTTPError as exc:
+            return exc.code, json.loads(exc.read() or b"null")
+
+
+class InProcessTransport:
+    def __init__(self) -> None:
+        os.environ.setdefault("CACHE_SNAPSHOT", "0")
+        import app
+
+        self._app = app.app
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, body: Any = None) -> tuple[int, Any]:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._app.test_client()
+        resp = client.open(path, method=method, json=body)
+        return resp.status_code, resp.get_json(silent=True)
+
+
+class Pools:
+    """JOs and DOs the next operations can act on, shared across threads."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.preparing: list[str] = []
+        self.delivering: list[str] = []
+        self.dos: list[str] = []
+
+    def take(self, pool: list[str], rng: random.Random) -> str | None:
+        with self.lock:
+            if not pool:
+                return None
+            idx = rng.randrange(len(pool))
+            pool[idx], pool[-1] = pool[-1], pool[idx]
+            return pool.pop()
+
+    def add(self, pool: list[str], value: str) -> None:
+        with self.lock:
+            pool.append(value)
+
+
+class Driver:
+    def __init__(self, transport: Any, data: Path, mix: dict[str, int]) -> None:
+        self.transport = transport
+        self.mix = mix
+        self.pools = Pools()
+        self.clients = [
+            str(r.get("client_code") or r.get("code"))
+            for r in db.iter_rows(data / "master" / db.CLIENT_MASTER_FILE.name)
+        ]
+        self.items = [
+            str(r.get("item_code") or r.get("code"))
+            for r in db.iter_rows(data / "master" / db.ITEM_MASTER_FILE.name)
+        ]
+        self.jo_numbers: Counter[str] = Counter()
+        self.do_numbers: Counter[str] = Counter()
+
+    def seed_pools(self) -> None:
+        today = date.today()
+        for back in range(3):
+            month = (today.month - back - 1) % 12 + 1
+            year = today.year - (today.month - back <= 0)
+            _, rows = self.transport.request(
+                "GET", f"/api/orders?year={year}&month={month}"
+            )
+            for row in rows or []:
+                if row["status"] == "Preparing":
+                    self.pools.preparing.append(row["jo_number"])
+                elif row["status"] == "Delivering":
+                    self.pools.delivering.append(row["jo_number"])
+                if row["do_client_number"]:
+                    self.pools.dos.append(row["do_client_number"])
+
+    def _call(self, op: str, rng: random.Random) -> tuple[str, int, Any]:
+        pools = self.pools
+        if op == "create":
+            lines = min(int(rng.expovariate(1 / 4)) + 1, 300)
+            payload = {
+                "client_code": rng.choice(self.clients),
+                "required_date": date.today().isoformat(),
+                "local_export": rng.choice(["Local", "Export"]),
+                "client_po_list": [f"LT{rng.randint(100000, 999999)}"],
+                "items": [
+                    {"item_code": rng.choice(self.items), "qty": rng.randint(1, 50)}
+                    for _ in range(lines)
+                ],
+            }
+            status, body = self.transport.request("POST", "/api/orders", payload)
+            if status == 200 and body.get("ok"):
+                jo_number = body["data"]["jo_number"]
+                with pools.lock:
+                    self.jo_numbers[jo_number] += 1
+                pools.add(pools.preparing, jo_number)
+            return op, status, body
+        if op == "confirm":
+            jo_number = pools.take(pools.preparing, rng)
+            if jo_number is not None:
+                path = f"/api/orders/{jo_number}/confirm"
+                status, body = self.transport.request("POST", path)
+                if status == 200 and body.get("ok"):
+                    do_number = body["data"]["do_client_number"]
+                    with pools.lock:
+                        self.do_numbers[do_number] += 1
+                    pools.add(pools.delivering, jo_number)
+                    pools.add(pools.dos, do_number)
+                return op, status, body
+        if op in ("complete", "cancel"):
+            jo_number = pools.take(pools.delivering, rng)
+            if jo_number is not None:
+                path = f"/api/orders/{jo_number}/{op}"
+                status, body = self.transport.request("POST", path)
+                return op, status, body
+        if op == "delivery":
+            with pools.lock:
+                do_number = rng.choice(pools.dos) if pools.dos else None
+            if do_number is not None:
+                status, body = self.transport.request(
+                    "GET", f"/api/delivery/{do_number}"
+                )
+                return op, status, body
+        # "list", or an operation whose pool has run dry
+        today = date.today()
+        month = rng.choice([today.month, (today.month - 2) % 12 + 1])
+        path = f"/api/orders?year={today.year}&month={month}"
+        status, body = self.transport.request("GET", path)
+        return "list", status, body
+
+    def run_level(self, concurrency: int, requests: int, seed: int) -> dict[str, Any]:
+        ops = list(self.mix)
+        weights = [self.mix[op] for op in ops]
+        latencies: dict[str, list[float]] = defaultdict(list)
+        errors: Counter[str] = Counter()
+        lock = threading.Lock()
+
+        def worker(worker_id: int, count: int) -> None:
+            rng = random.Random(seed * 1000 + worker_id)
+            for _ in range(count):
+                started = time.perf_counter()
+                op, status, body = self._call(rng.choices(ops, weights)[0], rng)
+                elapsed = time.perf_counter() - started
+                failed = status >= 400 or (
+                    isinstance(body, dict) and body.get("ok") is False
+                )
+                with lock:
+                    latencies[op].append(elapsed)
+                    if failed:
+                        errors[op] += 1
+
+        shares = [requests // concurrency] * concurrency
+        for idx in range(requests % concurrency):
+            shares[idx] += 1
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(worker, i, n) for i, n in enumerate(shares)]:
+                future.result()
+        wall = time.perf_counter() - started
+        return {"wall": wall, "latencies": latencies, "errors": errors}
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[rank]
+
+
+def _report(concurrency: int, result: dict[str, Any], driver: Driver) -> None:
+    latencies, errors = result["latencies"], result["errors"]
+    total = sum(len(v) for v in latencies.values())
+    print(
+        f"\nconcurrency {concurrency}: {total} requests in {result['wall']:.2f}s "
+        f"= {total / result['wall']:.1f} req/s, "
+        f"errors {sum(errors.values())} ({sum(errors.values()) / total:.1%})"
+    )
+    print(f"  {'op':<10}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'err':>6}")
+    rows = sorted(latencies.items())
+    rows.append(("all", [t for values in latencies.values() for t in values]))
+    for op, values in rows:
+        values = sorted(values)
+        p50, p95, p99 = (_percentile(values, p) * 1000 for p in (50, 95, 99))
+        err = sum(errors.values()) if op == "all" else errors[op]
+        print(f"  {op:<10}{len(values):>6}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}{err:>6}")
+    dup_jo = sum(1 for n in driver.jo_numbers.values() if n > 1)
+    dup_do = sum(1 for n in driver.do_numbers.values() if n > 1)
+    print(f"  duplicate JO numbers so far: {dup_jo}, duplicate DO numbers: {dup_do}")
+
+
+def _parse_mix(text: str) -> dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        op, _, weight = part.partition("=")
+        if op not in ("list", "create", "confirm", "complete", "cancel", "delivery"):
+            raise SystemExit(f"unknown operation in --mix: {op}")
+        mix[op] = int(weight)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", type=Path, default=ROOT / "benchmarks" / "loaddata")
+    parser.add_argument("--url", help="target a running app instead of in-process")
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--requests", type=int, default=200, help="per level")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.url:
+        transport: Any = HttpTransport(args.url)
+    else:
+        _point_db_at(args.data)
+        transport = InProcessTransport()
+    driver = Driver(transport, args.data, _parse_mix(args.mix))
+    driver.seed_pools()
+    for level in (int(c) for c in args.concurrency.split(",")):
+        _report(level, driver.run_level(level, args.requests, args.seed), driver)
+
+
+if __name__ == "__main__":
+    main()
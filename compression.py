@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import gzip
+
+from flask import Flask, Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+DEFAULT_MIN_SIZE = 16 * 1024
+
+
+def _pick_encoding() -> str | None:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress_response(response: Response) -> Response:
+    if (
+        response.direct_passthrough
+        or not 200 <= response.status_code < 300
+        or "Content-Encoding" in response.headers
+        or response.mimetype != "application/json"
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < current_app.config.get("COMPRESS_MIN_SIZE", DEFAULT_MIN_SIZE):
+        return response
+    encoding = _pick_encoding()
+    if encoding == "br":
+        body = brotli.compress(data, quality=4)
+    elif encoding == "gzip":
+        body = gzip.compress(data, compresslevel=5)
+    else:
+        return response
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    """Compress large JSON responses when the client accepts br or gzip.
+
+    ``COMPRESS_MIN_SIZE`` (bytes) sets the cut-off; ``COMPRESS_RESPONSES =
+    False`` in ``app.config`` before calling this turns compression off.
+    """
+    if app.config.get("COMPRESS_RESPONSES", True):
+        app.after_request(compress_response)
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 import json
+import os
+import pickle
 import re
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, date
 from pathlib import Path
-from typing import Any, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, TypeVar
 
-import pandas as pd
+# pandas (and openpyxl) are imported where a workbook is actually read or
+# written, so processes that are served from cache never pay for them.
+if TYPE_CHECKING:
+    import pandas as pd
 
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
@@ -14,11 +25,39 @@ MASTER_DIR = BASE_DIR / "master"
 
 JOB_ORDER_FILE = DATA_DIR / "job_order.xlsx"
 JOB_ORDER_ITEMS_FILE = DATA_DIR / "job_order_items.xlsx"
+JOB_ORDER_REFS_FILE = DATA_DIR / "job_order_refs.xlsx"
 DELIVERY_ORDER_FILE = DATA_DIR / "delivery_order.xlsx"
 DELIVERY_ORDER_ITEMS_FILE = DATA_DIR / "delivery_order_items.xlsx"
+SUPPLIER_PO_FILE = DATA_DIR / "supplier_po.xlsx"
+SUPPLIER_PO_ITEMS_FILE = DATA_DIR / "supplier_po_items.xlsx"
+
+ARCHIVE_DIRNAME = "archive"
 
 CLIENT_MASTER_FILE = MASTER_DIR / "client_master.xlsx"
 ITEM_MASTER_FILE = MASTER_DIR / "item_master.xlsx"
+SUPPLIER_MASTER_FILE = MASTER_DIR / "supplier_master.xlsx"
+
+SNAPSHOT_FILE = DATA_DIR / "cache_snapshot.pickle"
+# Bump when cached value layouts change so older snapshots are ignored.
+SNAPSHOT_VERSION = 1
+
+T = TypeVar("T")
+
+_CACHE: dict[tuple[str, tuple[Path, ...]], CacheEntry] = {}
+_PARSES: dict[Path, ParseStat] = {}
+
+# Held for a whole read-modify-write of the workbooks (see ``writing``), so
+# concurrent writers cannot both read the same "next" JO/DO number. Readers
+# never wait on it unless nothing usable is cached while a write is running.
+STORAGE_LOCK = threading.RLock()
+# Short lock around the cache itself: entry bookkeeping, in-place patches and
+# readers copying out of values that writers patch. Never held across a
+# workbook read or a ``cached`` call; taken after STORAGE_LOCK, never before.
+CACHE_LOCK = threading.RLock()
+
+_WRITER: int | None = None  # thread inside ``writing``
+_WRITE_DEPTH = 0
+_WRITE_GENERATION = 0
 
 
 def today_date() -> str:
@@ -29,12 +68,16 @@ def now_timestamp() -> str:
     return datetime.now().isoformat(timespec="seconds")
 
 
-def json_dumps_list(values: Iterable[str] | None) -> str:
+def as_str_list(values: Iterable[Any] | None) -> list[str]:
     if values is None:
-        return "[]"
+        return []
     if isinstance(values, str):
         values = [values]
-    return json.dumps(list(values), ensure_ascii=False)
+    return [str(x) for x in values]
+
+
+def json_dumps_list(values: Iterable[str] | None) -> str:
+    return json.dumps(as_str_list(values), ensure_ascii=False)
 
 
 def json_loads_list(value: str | None) -> list[str]:
@@ -49,28 +92,395 @@ def json_loads_list(value: str | None) -> list[str]:
     return [str(value)]
 
 
+def archive_path(path: Path, year: int | str) -> Path:
+    """Per-year archive copy of a table, e.g. ``data/archive/2025/job_order.xlsx``."""
+    return path.parent / ARCHIVE_DIRNAME / str(year) / path.name
+
+
+def archive_years(path: Path) -> list[int]:
+    """Years that have an archive of ``path``, newest first."""
+    root = path.parent / ARCHIVE_DIRNAME
+    if not root.is_dir():
+        return []
+    years = [
+        int(child.name)
+        for child in root.iterdir()
+        if child.name.isdigit() and (child / path.name).exists()
+    ]
+    return sorted(years, reverse=True)
+
+
 def _ensure_parent(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
+@dataclass
+class ParseStat:
+    rows: int
+    seconds: float
+    parsed_at: str
+    reader: str
+
+
+def _note_parse(path: Path, rows: int, started: float, reader: str) -> None:
+    _PARSES[path] = ParseStat(
+        rows=rows,
+        seconds=time.perf_counter() - started,
+        parsed_at=now_timestamp(),
+        reader=reader,
+    )
+
+
+def last_parse(path: Path) -> ParseStat | None:
+    """Row count and timing of the last complete read of ``path``."""
+    return _PARSES.get(path)
+
+
 def read_table(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
-    if not path.exists():
+    """The whole table, with ``columns`` first (added empty where missing).
+
+    Columns the caller does not know about are kept after them, so writing
+    the frame back never drops data, e.g. legacy columns not yet migrated.
+    """
+    import pandas as pd
+
+    if not path.exists() or path.stat().st_size == 0:
         return pd.DataFrame(columns=columns or [])
+    started = time.perf_counter()
     df = pd.read_excel(path, dtype=object)
+    _note_parse(path, len(df), started, "read_table")
     if columns:
         for col in columns:
             if col not in df.columns:
                 df[col] = ""
-        df = df[columns]
+        df = df[columns + [col for col in df.columns if col not in columns]]
     return df
 
 
+def iter_rows(
+    path: Path,
+    columns: list[str] | None = None,
+    where: Callable[[dict[str, Any]], bool] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream rows of the first sheet without loading the whole workbook.
+
+    Uses openpyxl in read-only mode, so memory stays flat regardless of file
+    size. ``columns`` projects each row (missing columns yield ``""`` just like
+    ``read_table``); ``where`` filters the projected rows. Empty cells come back
+    as ``None``.
+    """
+    if not path.exists() or path.stat().st_size == 0:
+        return
+    from openpyxl import load_workbook
+
+    started = time.perf_counter()
+    seen = 0
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        positions = {
+            str(name).strip(): idx
+            for idx, name in enumerate(header)
+            if name is not None
+        }
+        names = columns or list(positions)
+        picks = [(name, positions.get(name)) for name in names]
+        for values in rows:
+            if all(value is None for value in values):
+                continue
+            seen += 1
+            width = len(values)
+            row = {
+                name: (values[idx] if idx < width else None) if idx is not None else ""
+                for name, idx in picks
+            }
+            if where is None or where(row):
+                yield row
+        # Only full scans count; find_row stops early.
+        _note_parse(path, seen, started, "iter_rows")
+    finally:
+        workbook.close()
+
+
+def read_header(path: Path) -> list[str]:
+    """Return the column names of a table without reading its rows."""
+    return list(cached("header", [path], lambda: _read_header(path)))
+
+
+def _read_header(path: Path) -> tuple[str, ...]:
+    if not path.exists() or path.stat().st_size == 0:
+        return ()
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        header = next(workbook.active.iter_rows(values_only=True), None) or ()
+    finally:
+        workbook.close()
+    return tuple(str(name).strip() for name in header if name is not None)
+
+
+def count_rows(path: Path) -> int:
+    """Data rows in a table from the sheet's stored dimensions, without a scan.
+
+    Falls back to streaming the rows when the workbook has no dimensions.
+    """
+    if not path.exists() or path.stat().st_size == 0:
+        return 0
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        max_row = workbook.active.max_row
+    finally:
+        workbook.close()
+    if max_row is None:
+        return sum(1 for _ in iter_rows(path, columns=[]))
+    return max(max_row - 1, 0)
+
+
+def find_row(
+    path: Path,
+    where: Callable[[dict[str, Any]], bool],
+    columns: list[str] | None = None,
+) -> dict[str, Any] | None:
+    """Return the first row matching ``where``, stopping the scan there."""
+    rows = iter_rows(path, columns=columns, where=where)
+    try:
+        return next(rows, None)
+    finally:
+        rows.close()
+
+
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@dataclass
+class CacheEntry:
+    stamp: tuple[Any, ...]
+    value: Any
+    built_at: str
+    build_seconds: float
+    # Set when one of our own writes touched a source file; cleared by
+    # patch_cached once the value has been brought up to date in memory.
+    pending: bool = False
+
+
+@contextmanager
+def writing() -> Iterator[None]:
+    """Scope of one storage write: the read-modify-write and its cache patches.
+
+    Holds ``STORAGE_LOCK`` throughout. Meanwhile other threads keep reading
+    cached values as they were before the write until its patch lands, rather
+    than rebuilding from half-written tables. Entries the write touched but
+    no patch brought up to date are dropped at the end and rebuilt on next
+    use. Nests, and works as a decorator (``@writing()``).
+    """
+    global _WRITER, _WRITE_DEPTH, _WRITE_GENERATION
+    with STORAGE_LOCK:
+        outer = _WRITE_DEPTH == 0
+        if outer:
+            with CACHE_LOCK:
+                _WRITER = threading.get_ident()
+                _WRITE_GENERATION += 1
+        _WRITE_DEPTH += 1
+        try:
+            yield
+        finally:
+            _WRITE_DEPTH -= 1
+            if outer:
+                with CACHE_LOCK:
+                    for key in [k for k, e in _CACHE.items() if e.pending]:
+                        del _CACHE[key]
+                    _WRITER = None
+
+
+def cached(name: str, paths: Iterable[Path], build: Callable[[], T]) -> T:
+    """Return ``build()``, memoized until any of ``paths`` changes on disk.
+
+    Values are shared between callers and must be treated as read-only;
+    writers keep them current through ``patch_cached``. While another thread
+    is inside ``writing``, a value awaiting its patch is served as it was;
+    only when nothing usable is cached does the caller wait for the write.
+    """
+    sources = tuple(paths)
+    key = (name, sources)
+    me = threading.get_ident()
+    stamp = tuple(_file_stamp(p) for p in sources)
+    with CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None:
+            if entry.pending and _WRITER not in (None, me):
+                return entry.value
+            if not entry.pending and entry.stamp == stamp:
+                return entry.value
+        generation = _WRITE_GENERATION
+        other_writer = _WRITER not in (None, me)
+    if other_writer:
+        with STORAGE_LOCK:
+            return cached(name, sources, build)
+    started = time.perf_counter()
+    value = build()
+    with CACHE_LOCK:
+        # A write that began while we were reading may be half in the value.
+        if generation == _WRITE_GENERATION and _WRITER in (None, me):
+            _CACHE[key] = CacheEntry(
+                stamp=stamp,
+                value=value,
+                built_at=now_timestamp(),
+                build_seconds=time.perf_counter() - started,
+            )
+    return value
+
+
+def patch_cached(
+    name: str, paths: Iterable[Path], mutate: Callable[[Any], None]
+) -> None:
+    """Apply an in-memory update to a cached value after our own write.
+
+    Does nothing when the value is not cached, or was rebuilt from storage
+    after the write marked it pending (the rebuild already holds the change).
+    If the update fails the value is dropped rather than failing the write
+    that already succeeded; the next read rebuilds it from storage.
+    """
+    key = (name, tuple(paths))
+    with CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is None or not entry.pending:
+            return
+        try:
+            mutate(entry.value)
+        except Exception:
+            del _CACHE[key]
+            return
+        entry.pending = False
+
+
+def _note_write(path: Path, before: tuple[int, int] | None) -> None:
+    after = _file_stamp(path)
+    with CACHE_LOCK:
+        for key, entry in list(_CACHE.items()):
+            if path not in key[1]:
+                continue
+            idx = key[1].index(path)
+            if entry.stamp[idx] != before:
+                # Already stale before this write (edited outside the app).
+                del _CACHE[key]
+                continue
+            entry.stamp = entry.stamp[:idx] + (after,) + entry.stamp[idx + 1 :]
+            entry.pending = True
+
+
+def cache_entries() -> list[tuple[str, tuple[Path, ...], CacheEntry]]:
+    """``(name, sources, entry)`` for every cached value, for diagnostics."""
+    with CACHE_LOCK:
+        items = list(_CACHE.items())
+    return [(name, sources, entry) for (name, sources), entry in items]
+
+
+def is_fresh(sources: tuple[Path, ...], entry: CacheEntry) -> bool:
+    """Whether the entry is up to date with its source files."""
+    return not entry.pending and entry.stamp == tuple(_file_stamp(p) for p in sources)
+
+
+def invalidate(path: Path | None = None, name: str | None = None) -> None:
+    """Drop cached values built from ``path`` and/or called ``name``.
+
+    With neither argument everything is dropped.
+    """
+    with CACHE_LOCK:
+        for key in list(_CACHE):
+            if (path is None or path in key[1]) and (name is None or key[0] == name):
+                del _CACHE[key]
+
+
+def save_snapshot(path: Path | None = None) -> int:
+    """Write every up-to-date cached value to ``path``; returns the count.
+
+    The file is a pickle of the cache, so only load snapshots this app wrote.
+    """
+    path = path or SNAPSHOT_FILE
+    with CACHE_LOCK:
+        entries = {key: e for key, e in _CACHE.items() if not e.pending}
+    _ensure_parent(path)
+    # A temp file per writer: workers exiting together must not interleave.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(
+                (SNAPSHOT_VERSION, sys.version_info[:2], entries),
+                fh,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return len(entries)
+
+
+def load_snapshot(path: Path | None = None) -> int:
+    """Seed the cache from a snapshot; returns the number of entries kept.
+
+    Entries whose source files changed since the snapshot was written are
+    skipped and rebuilt on first use. A missing, unreadable or outdated
+    snapshot simply loads nothing.
+    """
+    path = path or SNAPSHOT_FILE
+    try:
+        with path.open("rb") as fh:
+            version, python, entries = pickle.load(fh)
+    except Exception:
+        return 0
+    if version != SNAPSHOT_VERSION or tuple(python) != sys.version_info[:2]:
+        return 0
+    kept = 0
+    with CACHE_LOCK:
+        for key, entry in entries.items():
+            if key in _CACHE:
+                continue
+            if entry.stamp == tuple(_file_stamp(p) for p in key[1]):
+                _CACHE[key] = entry
+                kept += 1
+    return kept
+
+
+def load_records(path: Path, record_type: type[T], columns: list[str]) -> list[T]:
+    """Load a table as a cached list of record objects (see ``records.py``)."""
+    return cached(
+        f"records:{record_type.__name__}",
+        [path],
+        lambda: [record_type.from_row(row) for row in iter_rows(path, columns)],
+    )
+
+
 def write_table(path: Path, df: pd.DataFrame) -> None:
     _ensure_parent(path)
-    df.to_excel(path, index=False)
+    with writing():
+        before = _file_stamp(path)
+        # Readers that stream the file directly never see a half-written one.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=path.suffix)
+        os.close(fd)
+        try:
+            df.to_excel(tmp, index=False)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        _note_write(path, before)
 
 
 def append_rows(path: Path, rows: list[dict[str, Any]], columns: list[str]) -> None:
+    import pandas as pd
+
     df = read_table(path, columns=columns)
     if rows:
         df = pd.concat([df, pd.DataFrame(rows)], ignore_index=True)
@@ -81,15 +491,33 @@ def update_rows(path: Path, df: pd.DataFrame) -> None:
     write_table(path, df)
 
 
-def next_number(df: pd.DataFrame, column: str, prefix: str, year_two: str) -> str:
-    pattern = re.compile(rf"^{re.escape(prefix)}{year_two}-(\d{{3}})$")
+def column_values(path: Path, column: str) -> list[Any]:
+    return [row[column] for row in iter_rows(path, columns=[column])]
+
+
+def next_number(
+    df: pd.DataFrame | None,
+    column: str,
+    prefix: str,
+    year_two: str,
+    extra_values: Iterable[Any] = (),
+) -> str:
+    """Next ``<prefix><yy>-NNN`` after the highest one in ``df[column]``.
+
+    ``extra_values`` adds numbers held elsewhere, e.g. in the year's archive
+    or a cached index (pass ``df=None`` when that holds them all).
+    """
+    pattern = re.compile(rf"^{re.escape(prefix)}{year_two}-(\d{{3,}})$")
     max_seq = 0
-    if column in df.columns:
-        for value in df[column].dropna().astype(str):
-            match = pattern.match(value.strip())
-            if match:
-                seq = int(match.group(1))
-                max_seq = max(max_seq, seq)
+    values = []
+    if df is not None and column in df.columns:
+        values = list(df[column].dropna().astype(str))
+    values += [str(value) for value in extra_values if value is not None]
+    for value in values:
+        match = pattern.match(value.strip())
+        if match:
+            seq = int(match.group(1))
+            max_seq = max(max_seq, seq)
     return f"{prefix}{year_two}-{max_seq + 1:03d}"
 
 
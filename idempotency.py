@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable
+
+from flask import Flask, Response, current_app, jsonify, request
+
+from db import STORAGE_LOCK
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+DEFAULT_TTL = 60 * 60
+DEFAULT_MAX_ENTRIES = 1024
+MAX_KEY_LENGTH = 255
+
+# (status, body, mimetype) of a stored response, plus a hash of the request
+# body it answered
+Stored = tuple[int, bytes, str, str]
+
+
+class ResultCache:
+    """Bounded LRU of responses that expire ``ttl`` seconds after being stored."""
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Stored]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Stored | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, stored = entry
+        if expires <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return stored
+
+    def put(self, key: str, stored: Stored) -> None:
+        now = self._clock()
+        self._entries[key] = (now + self.ttl, stored)
+        self._entries.move_to_end(key)
+        # Entries share one TTL, so the oldest ones expire first.
+        while self._entries:
+            oldest_key, (expires, _) = next(iter(self._entries.items()))
+            if expires > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[oldest_key]
+
+
+def _replay(stored: Stored) -> Response:
+    status, body, mimetype, _ = stored
+    response = Response(body, status=status, mimetype=mimetype)
+    response.headers[REPLAYED_HEADER] = "true"
+    return response
+
+
+def idempotent(
+    natural_key: Callable[..., str | None] | None = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Replay the stored response for a repeated mutating request.
+
+    Requests are matched on the ``Idempotency-Key`` header (scoped to the
+    path) and, when given, on ``natural_key(**view_args)``: a key derived from
+    the target's state that makes a repeat recognisable without a header.
+    Reusing a header key with a different request body is answered with 422.
+    Only successful responses are stored. The handler runs under the storage
+    lock, so a retry that races the original waits for it and replays it.
+    Both the lock and the stored responses are per process.
+    """
+
+    def decorate(view: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(view)
+        def wrapper(**view_args: Any) -> Any:
+            cache: ResultCache = current_app.extensions["idempotency"]
+            header = request.headers.get(HEADER, "").strip()
+            if len(header) > MAX_KEY_LENGTH:
+                error = f"{HEADER} must be at most {MAX_KEY_LENGTH} characters"
+                return jsonify({"ok": False, "error": error}), 400
+            header_key = f"{request.path}:{header}" if header else None
+            body_hash = hashlib.sha256(request.get_data()).hexdigest()
+
+            with STORAGE_LOCK:
+                stored = cache.get(header_key) if header_key else None
+                if stored is not None and stored[3] != body_hash:
+                    error = f"{HEADER} was already used with a different request"
+                    return jsonify({"ok": False, "error": error}), 422
+                if stored is None and natural_key is not None:
+                    done_key = natural_key(**view_args)
+                    stored = cache.get(done_key) if done_key else None
+                if stored is not None:
+                    return _replay(stored)
+
+                response = current_app.make_response(view(**view_args))
+                if 200 <= response.status_code < 300:
+                    stored = (
+                        response.status_code,
+                        response.get_data(),
+                        response.mimetype,
+                        body_hash,
+                    )
+                    done_key = natural_key(**view_args) if natural_key else None
+                    for key in (header_key, done_key):
+                        if key:
+                            cache.put(key, stored)
+                return response
+
+        return wrapper
+
+    return decorate
+
+
+def init_idempotency(app: Flask) -> None:
+    """Set up the response cache used by ``@idempotent`` views.
+
+    ``IDEMPOTENCY_TTL`` (seconds) and ``IDEMPOTENCY_MAX_ENTRIES`` in
+    ``app.config`` bound how long and how many responses are kept.
+    """
+    app.extensions["idempotency"] = ResultCache(
+        ttl=app.config.get("IDEMPOTENCY_TTL", DEFAULT_TTL),
+        max_entries=app.config.get("IDEMPOTENCY_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+    )
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import math
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def _default(value: Any) -> Any:
+    """Encode what the JSON libraries can't: numpy/pandas scalars, NaT, NA."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        # pandas.NaT is a datetime subclass whose isoformat() is "NaT".
+        return None if value != value else value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    item = getattr(value, "item", None)
+    if item is not None:
+        return _finite(item())
+    if value.__class__.__name__ == "NAType":
+        return None
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _finite(value: Any) -> Any:
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _sanitize(value: Any) -> Any:
+    if isinstance(value, float):
+        return _finite(value)
+    if isinstance(value, dict):
+        return {k: _sanitize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_sanitize(v) for v in value]
+    return value
+
+
+def encode(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON; NaN/inf become ``null`` on both backends."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    try:
+        text = json.dumps(obj, default=_default, ensure_ascii=False, allow_nan=False)
+    except ValueError:
+        # Only payloads that actually contain NaN/inf pay for the extra walk.
+        text = json.dumps(_sanitize(obj), default=_default, ensure_ascii=False)
+    return text.encode("utf-8")
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson when installed, stdlib otherwise."""
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return encode(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(encode(obj), mimetype=self.mimetype)
@@ -1,4 +1,46 @@
+from __future__ import annotations
+
+import argparse
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Order Tracking System")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser(
+        "migrate-list-fields",
+        help="move JSON client_po_list/do_to_supplier_list cells into job_order_refs",
+    )
+    archive = commands.add_parser(
+        "archive", help="move closed orders into per-year archive tables"
+    )
+    archive.add_argument(
+        "--older-than-days",
+        type=int,
+        default=None,
+        help="archive Completed/Canceled orders closed more than N days ago",
+    )
+    commands.add_parser(
+        "snapshot",
+        help="build the table indexes and save them for a warm app start",
+    )
+    args = parser.parse_args()
+
+    if args.command == "migrate-list-fields":
+        from services import migrate_list_fields
+
+        print(migrate_list_fields())
+        return
+    if args.command == "archive":
+        from services.archive_service import ARCHIVE_AFTER_DAYS, archive_orders
+
+        days = args.older_than_days
+        print(archive_orders(ARCHIVE_AFTER_DAYS if days is None else days))
+        return
+    if args.command == "snapshot":
+        from services.cache_service import write_snapshot
+
+        print({"entries": write_snapshot()})
+        return
     print("Order Tracking System - backend services ready.")
 
 
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import dataclass, fields
+from enum import Enum
+from typing import Any, Callable, Mapping
+
+
+class Status(str, Enum):
+    PREPARING = "Preparing"
+    DELIVERING = "Delivering"
+    COMPLETED = "Completed"
+    CANCELED = "Canceled"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+def clean(value: Any) -> Any:
+    """Map empty cells (None, NaN, NaT, pd.NA) to ``""``; keep everything else."""
+    if value is None:
+        return ""
+    try:
+        if value != value:
+            return ""
+    except TypeError:
+        return ""
+    return value
+
+
+def clean_str(value: Any) -> str:
+    return str(clean(value))
+
+
+def _text(value: Any) -> str:
+    return sys.intern(clean_str(value))
+
+
+def _status(value: Any) -> Status | str:
+    text = clean_str(value)
+    try:
+        return Status(text)
+    except ValueError:
+        return sys.intern(text)
+
+
+def _str_list(value: Any) -> tuple[str, ...]:
+    if isinstance(value, (list, tuple)):
+        return tuple(str(x) for x in value)
+    text = clean_str(value)
+    if not text or text == "[]":
+        return ()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return (text,)
+    if isinstance(data, list):
+        return tuple(str(x) for x in data)
+    return (text,)
+
+
+_PLANS: dict[type, list[tuple[str, Callable[[Any], Any]]]] = {}
+
+
+def _plan(cls: type) -> list[tuple[str, Callable[[Any], Any]]]:
+    plan = _PLANS.get(cls)
+    if plan is None:
+        convert = cls._converters
+        plan = [(f.name, convert.get(f.name, clean_str)) for f in fields(cls)]
+        _PLANS[cls] = plan
+    return plan
+
+
+class _Record:
+    """Shared converters for the slotted record types below."""
+
+    __slots__ = ()
+    _converters: dict[str, Callable[[Any], Any]] = {}
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]):
+        return cls(*[convert(row.get(name)) for name, convert in _plan(cls)])
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {}
+        for name, _ in _plan(type(self)):
+            value = getattr(self, name)
+            if isinstance(value, tuple):
+                value = list(value)
+            elif isinstance(value, Status):
+                value = value.value
+            data[name] = value
+        return data
+
+
+_ORDER_CONVERTERS = {
+    "issue_date": _text,
+    "client_po_list": _str_list,
+    "client_code": _text,
+    "client_name": _text,
+    "required_date": _text,
+    "local_export": _text,
+    "do_to_supplier_list": _str_list,
+    "status": _status,
+    "complete_date": _text,
+}
+
+_ITEM_CONVERTERS = {
+    "item_code": _text,
+    "item_description": _text,
+    "width": clean,
+    "length": clean,
+    "qty": clean,
+}
+
+
+@dataclass(slots=True)
+class JobOrder(_Record):
+    id: str
+    jo_number: str
+    issue_date: str
+    client_po_list: tuple[str, ...]
+    client_code: str
+    client_name: str
+    required_date: str
+    local_export: str
+    remark: str
+    do_to_supplier_list: tuple[str, ...]
+    do_to_client_number: str
+    status: Status | str
+    complete_date: str
+    created_at: str
+    updated_at: str
+
+    _converters = _ORDER_CONVERTERS
+
+
+@dataclass(slots=True)
+class JobOrderItem(_Record):
+    id: str
+    jo_number: str
+    item_code: str
+    item_description: str
+    width: Any
+    length: Any
+    qty: Any
+    created_at: str
+    updated_at: str
+
+    _converters = _ITEM_CONVERTERS
+
+
+@dataclass(slots=True)
+class DeliveryOrder(_Record):
+    id: str
+    do_client_number: str
+    issue_date: str
+    jo_number: str
+    client_code: str
+    client_name: str
+    delivery_address: str
+    client_pic: str
+    client_contact: str
+    remark: str
+    status: Status | str
+    complete_date: str
+    created_at: str
+    updated_at: str
+
+    _converters = _ORDER_CONVERTERS
+
+
+@dataclass(slots=True)
+class DeliveryOrderItem(_Record):
+    id: str
+    do_client_number: str
+    item_code: str
+    item_description: str
+    width: Any
+    length: Any
+    qty: Any
+    created_at: str
+    updated_at: str
+
+    _converters = _ITEM_CONVERTERS
+
+
+@dataclass(slots=True)
+class SupplierPO(_Record):
+    supplier_po_id: str
+    supplier_po_no: str
+    supplier_code: str
+    order_id: str
+    issue_date: str
+    po_status: str
+    received_date: str
+    remark: str
+    created_at: str
+    updated_at: str
+
+    _converters = {
+        "supplier_code": _text,
+        "issue_date": _text,
+        "po_status": _text,
+        "received_date": _text,
+    }
+
+
+@dataclass(slots=True)
+class SupplierPOItem(_Record):
+    supplier_po_item_id: str
+    supplier_po_no: str
+    order_id: str
+    order_item_id: str
+    item_code: str
+    item_description: str
+    qty: Any
+    received_qty: Any
+    item_remark: str
+    item_status: str
+    created_at: str
+    updated_at: str
+
+    _converters = {**_ITEM_CONVERTERS, "received_qty": clean, "item_status": _text}
@@ -1,13 +1,42 @@
-from services.order_service import create_order_draft, confirm_order
+from services.order_service import (
+    ValidationError,
+    create_order_draft,
+    confirm_order,
+)
 from services.order_status_service import complete_order, cancel_order
-from services.delivery_service import get_delivery_order
+from services.delivery_service import get_delivery_order, get_delivery_orders
 from services.dashboard_service import list_orders
+from services.order_query_service import query_orders
+from services.order_refs_service import find_orders_by_ref, migrate_list_fields
+from services.search_service import search_orders
+from services.stats_service import get_order_stats
+from services.supplier_service import (
+    create_supplier_po,
+    get_supplier,
+    get_supplier_po,
+    link_supplier_po,
+    list_supplier_pos_for_order,
+    receive_supplier_po,
+)
 
 __all__ = [
+    "ValidationError",
     "create_order_draft",
     "confirm_order",
     "complete_order",
     "cancel_order",
     "get_delivery_order",
+    "get_delivery_orders",
     "list_orders",
+    "query_orders",
+    "find_orders_by_ref",
+    "migrate_list_fields",
+    "search_orders",
+    "get_order_stats",
+    "create_supplier_po",
+    "receive_supplier_po",
+    "link_supplier_po",
+    "get_supplier_po",
+    "list_supplier_pos_for_order",
+    "get_supplier",
 ]
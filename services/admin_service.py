@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import os
+import sys
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from db import (
+    CLIENT_MASTER_FILE,
+    DATA_DIR,
+    DELIVERY_ORDER_FILE,
+    DELIVERY_ORDER_ITEMS_FILE,
+    ITEM_MASTER_FILE,
+    JOB_ORDER_FILE,
+    JOB_ORDER_ITEMS_FILE,
+    JOB_ORDER_REFS_FILE,
+    STORAGE_LOCK,
+    SUPPLIER_MASTER_FILE,
+    SUPPLIER_PO_FILE,
+    SUPPLIER_PO_ITEMS_FILE,
+    archive_path,
+    archive_years,
+    cache_entries,
+    count_rows,
+    invalidate,
+    is_fresh,
+    last_parse,
+)
+from services.cache_service import warm_caches
+
+_ATOMS = (str, bytes, int, float, bool, type(None), Enum)
+
+
+def _hot_tables() -> dict[str, Path]:
+    paths = [
+        JOB_ORDER_FILE,
+        JOB_ORDER_ITEMS_FILE,
+        JOB_ORDER_REFS_FILE,
+        DELIVERY_ORDER_FILE,
+        DELIVERY_ORDER_ITEMS_FILE,
+        SUPPLIER_PO_FILE,
+        SUPPLIER_PO_ITEMS_FILE,
+        CLIENT_MASTER_FILE,
+        ITEM_MASTER_FILE,
+        SUPPLIER_MASTER_FILE,
+    ]
+    return {path.stem: path for path in paths}
+
+
+def _tables() -> dict[str, Path]:
+    """Hot tables by file stem, plus archives as ``<stem>@<year>``."""
+    tables = _hot_tables()
+    for name, path in list(tables.items()):
+        for year in archive_years(path):
+            tables[f"{name}@{year}"] = archive_path(path, year)
+    return tables
+
+
+def _table_name(path: Path) -> str:
+    for name, table in _tables().items():
+        if table == path:
+            return name
+    return str(path)
+
+
+def deep_size(value: Any) -> int:
+    """Approximate bytes held by ``value`` and everything it references.
+
+    Objects shared with other values (interned strings, enum members) are
+    counted in each value that holds them.
+    """
+    seen: set[int] = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, _ATOMS):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, "__dict__"):
+                stack.append(vars(obj))
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return total
+
+
+def table_status() -> list[dict[str, Any]]:
+    """Row count, file size and last parse of every table, hot and archived."""
+    status = []
+    for name, path in _tables().items():
+        exists = path.exists()
+        parse = last_parse(path)
+        status.append(
+            {
+                "table": name,
+                "path": str(path),
+                "exists": exists,
+                "size_bytes": path.stat().st_size if exists else 0,
+                "rows": count_rows(path),
+                "last_parse": (
+                    {
+                        "at": parse.parsed_at,
+                        "rows": parse.rows,
+                        "seconds": round(parse.seconds, 4),
+                        "reader": parse.reader,
+                    }
+                    if parse
+                    else None
+                ),
+            }
+        )
+    return status
+
+
+def cache_status() -> list[dict[str, Any]]:
+    """Every cached index with its sources, build time and memory footprint."""
+    return [
+        {
+            "name": name,
+            "tables": [_table_name(path) for path in sources],
+            "built_at": entry.built_at,
+            "build_seconds": round(entry.build_seconds, 4),
+            "fresh": is_fresh(sources, entry),
+            "size_bytes": deep_size(entry.value),
+        }
+        for name, sources, entry in cache_entries()
+    ]
+
+
+def reload_table(table: str) -> list[dict[str, Any]]:
+    """Drop every index built from ``table`` and rebuild the app's indexes.
+
+    For use after a table was edited by hand; returns the rebuilt entries.
+    """
+    path = _tables().get(table)
+    if path is None:
+        raise ValueError(f"Unknown table: {table}")
+    with STORAGE_LOCK:
+        invalidate(path=path)
+        warm_caches()
+    return [entry for entry in cache_status() if table in entry["tables"]]
+
+
+def storage_health() -> dict[str, Any]:
+    """Cheap liveness check: stat calls and a non-blocking lock probe only."""
+    tables = {}
+    for name, path in _hot_tables().items():
+        if not path.exists():
+            tables[name] = "missing"
+        elif not os.access(path, os.R_OK):
+            tables[name] = "unreadable"
+        else:
+            tables[name] = "ok"
+    writable = os.access(DATA_DIR, os.W_OK)
+    free = STORAGE_LOCK.acquire(blocking=False)
+    if free:
+        STORAGE_LOCK.release()
+    return {
+        "ok": writable and "unreadable" not in tables.values(),
+        "data_dir_writable": writable,
+        "storage_lock": "free" if free else "held",
+        "tables": tables,
+    }
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import re
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from db import (
+    DELIVERY_ORDER_FILE,
+    DELIVERY_ORDER_ITEMS_FILE,
+    JOB_ORDER_FILE,
+    JOB_ORDER_ITEMS_FILE,
+    JOB_ORDER_REFS_FILE,
+    CACHE_LOCK,
+    append_rows,
+    archive_path,
+    archive_years,
+    read_table,
+    write_table,
+    writing,
+)
+from records import JobOrder
+from services.order_refs_service import load_job_orders, load_ref_index, refs_for
+from services.order_service import (
+    DELIVERY_ORDER_COLUMNS,
+    DELIVERY_ORDER_ITEM_COLUMNS,
+    JOB_ORDER_COLUMNS,
+    JOB_ORDER_ITEM_COLUMNS,
+    JOB_ORDER_REF_COLUMNS,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ARCHIVE_AFTER_DAYS = 180
+TERMINAL_STATUSES = ("Completed", "Canceled")
+
+_NUMBER_YEAR = re.compile(r"^[A-Z]+(\d{2})-\d+$")
+
+
+def _number_year(number: str) -> int | None:
+    """Issue year encoded in a JO/DO number, e.g. ``DO25-014`` -> 2025."""
+    match = _NUMBER_YEAR.match(str(number).strip())
+    return 2000 + int(match.group(1)) if match else None
+
+
+def _candidate_years(path: Path, number: str) -> list[int]:
+    year = _number_year(number)
+    years = archive_years(path)
+    return [year] if year in years else years
+
+
+def with_archives(*paths: Path) -> list[Path]:
+    """Each path followed by its archived copies, for cache source lists."""
+    return [
+        source
+        for path in paths
+        for source in [path] + [archive_path(path, y) for y in archive_years(path)]
+    ]
+
+
+def load_archived_job_orders(year: int) -> dict[str, JobOrder]:
+    return load_job_orders(
+        archive_path(JOB_ORDER_FILE, year), archive_path(JOB_ORDER_REFS_FILE, year)
+    )
+
+
+def iter_all_job_orders() -> Iterator[JobOrder]:
+    """Hot job orders followed by every archived year, newest first."""
+    hot = load_job_orders()
+    with CACHE_LOCK:
+        orders = list(hot.values())
+    yield from orders
+    for year in archive_years(JOB_ORDER_FILE):
+        for jo_number, order in load_archived_job_orders(year).items():
+            if jo_number not in hot:
+                yield order
+
+
+def job_orders_for_year(year: int) -> list[JobOrder]:
+    """Hot orders plus the year's archive, for listing a past month."""
+    orders = load_job_orders()
+    archived = (
+        load_archived_job_orders(year) if year in archive_years(JOB_ORDER_FILE) else {}
+    )
+    with CACHE_LOCK:
+        hot = list(orders.values())
+        return hot + [o for jo, o in archived.items() if jo not in orders]
+
+
+def find_job_order(jo_number: str) -> JobOrder | None:
+    """A job order from the hot table or, failing that, the archives."""
+    order = load_job_orders().get(str(jo_number))
+    if order is not None:
+        return order
+    for year in _candidate_years(JOB_ORDER_FILE, jo_number):
+        order = load_archived_job_orders(year).get(str(jo_number))
+        if order is not None:
+            return order
+    return None
+
+
+def all_refs_for(jo_number: str) -> dict[str, tuple[str, ...]]:
+    """``refs_for`` that falls through to archived refs."""
+    refs = refs_for(jo_number)
+    if refs:
+        return refs
+    for year in _candidate_years(JOB_ORDER_REFS_FILE, jo_number):
+        index = load_ref_index(archive_path(JOB_ORDER_REFS_FILE, year))
+        if jo_number in index["by_jo"]:
+            return index["by_jo"][jo_number]
+    return refs
+
+
+def delivery_archive_years(do_number: str) -> list[int]:
+    """Archive years that may hold ``do_number``, most likely first."""
+    return _candidate_years(DELIVERY_ORDER_FILE, do_number)
+
+
+def _year_of(dates: pd.Series) -> pd.Series:
+    return dates.astype(str).str.slice(0, 4)
+
+
+def _move(
+    path: Path,
+    columns: list[str],
+    select: Callable[[pd.DataFrame], pd.Series],
+    year_of: Callable[[pd.DataFrame], pd.Series],
+) -> pd.DataFrame:
+    """Append the selected rows to their year's archive, then drop them here.
+
+    The archive is written first so an interrupted run leaves duplicates that
+    reads already tolerate, never lost rows.
+    """
+    df = read_table(path, columns=columns)
+    if df.empty:
+        return df
+    mask = select(df)
+    moving = df[mask]
+    if moving.empty:
+        return moving
+    years = year_of(moving)
+    for year, rows in moving.groupby(years):
+        append_rows(archive_path(path, year), rows.to_dict("records"), columns)
+    write_table(path, df[~mask])
+    return moving
+
+
+@writing()
+def archive_orders(
+    older_than_days: int = ARCHIVE_AFTER_DAYS, today: date | None = None
+) -> dict[str, int]:
+    """Move closed orders older than ``older_than_days`` into per-year archives.
+
+    A Completed/Canceled JO qualifies once its complete_date (or updated_at)
+    is older than the cut-off. Its items and refs go to the archive of the
+    JO's issue year. Its DOs and their items go to the DO's issue year, which
+    is also the year in its number. Reads fall through to the archives.
+    """
+    cutoff = ((today or date.today()) - timedelta(days=older_than_days)).isoformat()
+
+    def _closed(df: pd.DataFrame) -> pd.Series:
+        closed_on = df["complete_date"].where(
+            df["complete_date"].astype(str).str.match(r"^\d{4}-"), df["updated_at"]
+        )
+        return (
+            df["status"].isin(TERMINAL_STATUSES)
+            & (closed_on.astype(str).str.slice(0, 10) < cutoff)
+            & _year_of(df["issue_date"]).str.isdigit()
+        )
+
+    orders = _move(
+        JOB_ORDER_FILE,
+        JOB_ORDER_COLUMNS,
+        _closed,
+        lambda df: _year_of(df["issue_date"]),
+    )
+    if orders.empty:
+        return {"job_orders": 0, "delivery_orders": 0}
+    jo_year = dict(zip(orders["jo_number"].astype(str), _year_of(orders["issue_date"])))
+
+    def _of_moved_jo(df: pd.DataFrame) -> pd.Series:
+        return df["jo_number"].astype(str).isin(jo_year)
+
+    def _jo_year(df: pd.DataFrame) -> pd.Series:
+        return df["jo_number"].astype(str).map(jo_year)
+
+    _move(JOB_ORDER_ITEMS_FILE, JOB_ORDER_ITEM_COLUMNS, _of_moved_jo, _jo_year)
+    _move(JOB_ORDER_REFS_FILE, JOB_ORDER_REF_COLUMNS, _of_moved_jo, _jo_year)
+
+    def _do_year(df: pd.DataFrame) -> pd.Series:
+        issued = _year_of(df["issue_date"])
+        return issued.where(issued.str.isdigit(), _jo_year(df))
+
+    deliveries = _move(
+        DELIVERY_ORDER_FILE, DELIVERY_ORDER_COLUMNS, _of_moved_jo, _do_year
+    )
+    if not deliveries.empty:
+        do_year = dict(
+            zip(deliveries["do_client_number"].astype(str), _do_year(deliveries))
+        )
+        _move(
+            DELIVERY_ORDER_ITEMS_FILE,
+            DELIVERY_ORDER_ITEM_COLUMNS,
+            lambda df: df["do_client_number"].astype(str).isin(do_year),
+            lambda df: df["do_client_number"].astype(str).map(do_year),
+        )
+    return {"job_orders": len(orders), "delivery_orders": len(deliveries)}
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from db import (
+    DELIVERY_ORDER_FILE,
+    JOB_ORDER_FILE,
+    read_header,
+    save_snapshot,
+)
+from services.order_query_service import load_query_index
+from services.order_refs_service import load_job_orders, load_ref_index
+from services.order_service import load_item_descriptions
+from services.search_service import load_search_index
+from services.stats_service import get_order_stats
+from services.supplier_service import load_po_index, load_supplier_master
+
+
+def warm_caches() -> None:
+    """Build every table index the API serves from, as a first request would."""
+    read_header(JOB_ORDER_FILE)
+    read_header(DELIVERY_ORDER_FILE)
+    load_item_descriptions()
+    load_ref_index()
+    load_job_orders()
+    load_query_index()
+    load_search_index()
+    get_order_stats()
+    load_supplier_master()
+    load_po_index()
+
+
+def write_snapshot() -> int:
+    """Warm the caches and write them out for the next process to start from."""
+    warm_caches()
+    return save_snapshot()
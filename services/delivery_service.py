@@ -1,49 +1,136 @@
 from __future__ import annotations
 
-from typing import Any
-
-import pandas as pd
+from pathlib import Path
+from typing import Any, Iterable
 
 from db import (
     DELIVERY_ORDER_FILE,
     DELIVERY_ORDER_ITEMS_FILE,
-    json_loads_list,
-    read_table,
+    archive_path,
+    find_row,
+    iter_rows,
+)
+from records import DeliveryOrder, DeliveryOrderItem
+from services.archive_service import all_refs_for, delivery_archive_years
+from services.order_service import (
+    DELIVERY_ORDER_COLUMNS,
+    DELIVERY_ORDER_ITEM_COLUMNS,
+    REF_CLIENT_PO,
 )
-from services.order_service import DELIVERY_ORDER_COLUMNS, DELIVERY_ORDER_ITEM_COLUMNS
 
 
 def get_delivery_order(do_client_number: str) -> dict[str, Any]:
-    delivery_df = read_table(DELIVERY_ORDER_FILE, columns=DELIVERY_ORDER_COLUMNS)
-    if delivery_df.empty:
+    archived_years = delivery_archive_years(do_client_number)
+    if not DELIVERY_ORDER_FILE.exists() and not archived_years:
         raise ValueError("No delivery orders found")
-    mask = delivery_df["do_client_number"].astype(str) == str(do_client_number)
-    if not mask.any():
-        raise ValueError(f"DO number not found: {do_client_number}")
-    record = delivery_df.loc[mask].iloc[0].to_dict()
 
-    items_df = read_table(
-        DELIVERY_ORDER_ITEMS_FILE, columns=DELIVERY_ORDER_ITEM_COLUMNS
-    )
-    items = items_df[items_df["do_client_number"].astype(str) == str(do_client_number)]
+    def _same_do(row: dict[str, Any]) -> bool:
+        return str(row["do_client_number"]) == str(do_client_number)
 
-    def _clean(value: Any) -> Any:
-        if pd.isna(value):
-            return ""
-        return value
+    # Hot table first, then the archives most likely to hold this number.
+    sources = [(DELIVERY_ORDER_FILE, DELIVERY_ORDER_ITEMS_FILE)] + [
+        (
+            archive_path(DELIVERY_ORDER_FILE, year),
+            archive_path(DELIVERY_ORDER_ITEMS_FILE, year),
+        )
+        for year in archived_years
+    ]
+    for order_path, items_path in sources:
+        row = find_row(order_path, _same_do, columns=DELIVERY_ORDER_COLUMNS)
+        if row is not None:
+            break
+    else:
+        raise ValueError(f"DO number not found: {do_client_number}")
+    record = DeliveryOrder.from_row(row)
+
+    items = iter_rows(items_path, columns=DELIVERY_ORDER_ITEM_COLUMNS, where=_same_do)
+    return delivery_payload(record, [DeliveryOrderItem.from_row(i) for i in items])
 
-    items_list = []
-    for row in items.to_dict(orient="records"):
-        items_list.append({k: _clean(v) for k, v in row.items()})
 
+def delivery_payload(
+    record: DeliveryOrder, items: Iterable[DeliveryOrderItem]
+) -> dict[str, Any]:
     return {
-        "do_client_number": _clean(record.get("do_client_number", "")),
-        "client_code": _clean(record.get("client_code", "")),
-        "client_name": _clean(record.get("client_name", "")),
-        "delivery_address": _clean(record.get("delivery_address", "")),
-        "client_pic": _clean(record.get("client_pic", "")),
-        "client_contact": _clean(record.get("client_contact", "")),
-        "client_po_list": json_loads_list(record.get("client_po_list", "")),
-        "remark": _clean(record.get("remark", "")),
-        "items": items_list,
+        "do_client_number": record.do_client_number,
+        "issue_date": record.issue_date,
+        "jo_number": record.jo_number,
+        "client_code": record.client_code,
+        "client_name": record.client_name,
+        "delivery_address": record.delivery_address,
+        "client_pic": record.client_pic,
+        "client_contact": record.client_contact,
+        "client_po_list": list(all_refs_for(record.jo_number).get(REF_CLIENT_PO, ())),
+        "remark": record.remark,
+        "updated_at": record.updated_at,
+        "items": [item.to_dict() for item in items],
     }
+
+
+def find_delivery_orders(
+    do_numbers: Iterable[str],
+) -> dict[str, tuple[DeliveryOrder, Path]]:
+    """DO headers for many numbers, each with the items table that holds it.
+
+    One scan of the hot table, then one scan per archive year that may hold
+    any number not found there. Unknown numbers are left out.
+    """
+    wanted = {str(number) for number in do_numbers}
+    found: dict[str, tuple[DeliveryOrder, Path]] = {}
+    years = sorted(
+        {year for number in wanted for year in delivery_archive_years(number)},
+        reverse=True,
+    )
+    sources = [(DELIVERY_ORDER_FILE, DELIVERY_ORDER_ITEMS_FILE)] + [
+        (
+            archive_path(DELIVERY_ORDER_FILE, year),
+            archive_path(DELIVERY_ORDER_ITEMS_FILE, year),
+        )
+        for year in years
+    ]
+    for order_path, items_path in sources:
+        missing = wanted - found.keys()
+        if not missing:
+            break
+        rows = iter_rows(
+            order_path,
+            columns=DELIVERY_ORDER_COLUMNS,
+            where=lambda row: str(row["do_client_number"]) in missing,
+        )
+        for row in rows:
+            record = DeliveryOrder.from_row(row)
+            found.setdefault(record.do_client_number, (record, items_path))
+    return found
+
+
+def load_delivery_items(
+    headers: dict[str, tuple[DeliveryOrder, Path]],
+) -> dict[str, list[DeliveryOrderItem]]:
+    """Items of the given DOs, one scan per items table involved."""
+    items: dict[str, list[DeliveryOrderItem]] = {number: [] for number in headers}
+    by_path: dict[Path, set[str]] = {}
+    for number, (_, items_path) in headers.items():
+        by_path.setdefault(items_path, set()).add(number)
+    for items_path, numbers in by_path.items():
+        rows = iter_rows(
+            items_path,
+            columns=DELIVERY_ORDER_ITEM_COLUMNS,
+            where=lambda row: str(row["do_client_number"]) in numbers,
+        )
+        for row in rows:
+            item = DeliveryOrderItem.from_row(row)
+            items[item.do_client_number].append(item)
+    return items
+
+
+def get_delivery_orders(do_numbers: Iterable[str]) -> list[dict[str, Any]]:
+    """``get_delivery_order`` for many DOs at once, in the order given.
+
+    Raises ``ValueError`` naming every number that was not found.
+    """
+    do_numbers = [str(number) for number in do_numbers]
+    headers = find_delivery_orders(do_numbers)
+    missing = [number for number in do_numbers if number not in headers]
+    if missing:
+        raise ValueError(f"DO number not found: {', '.join(missing)}")
+    items = load_delivery_items(headers)
+    return [delivery_payload(headers[n][0], items[n]) for n in do_numbers]
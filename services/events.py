@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Callable
+
+# Published by the order services after their storage writes succeed, so
+# in-memory indexes can be patched instead of rebuilt from the workbooks.
+ORDER_CREATED = "order_created"
+ORDER_CONFIRMED = "order_confirmed"
+ORDER_STATUS_CHANGED = "order_status_changed"
+
+_HANDLERS: dict[str, list[Callable[..., None]]] = defaultdict(list)
+
+
+def subscribe(event: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    def register(handler: Callable[..., None]) -> Callable[..., None]:
+        _HANDLERS[event].append(handler)
+        return handler
+
+    return register
+
+
+def publish(event: str, **payload: Any) -> None:
+    for handler in _HANDLERS[event]:
+        handler(**payload)
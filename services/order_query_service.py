@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from db import JOB_ORDER_FILE, JOB_ORDER_REFS_FILE, cached
+from records import JobOrder, Status
+from services.archive_service import iter_all_job_orders, with_archives
+from services.dashboard_service import order_summary
+
+if TYPE_CHECKING:
+    import numpy as np
+
+OPEN_STATUSES = (Status.PREPARING.value, Status.DELIVERING.value)
+_LOWEST_DATE = "0000-00-00"
+_HIGHEST_DATE = "9999-99-99"
+
+# A predicate the planner can apply: its field name for the plan, a boolean mask over
+# candidate positions, and (when an index covers it) the positions it selects.
+Predicate = tuple[str, Callable[["np.ndarray"], "np.ndarray"], "np.ndarray | None"]
+
+
+class OrderQueryIndex:
+    """Column arrays over all job orders plus the indexes the planner can use.
+
+    Indexed: status and client_code (value -> positions) and issue_date
+    (sorted, for range lookups). required_date, local_export and overdue are
+    evaluated as vectorized masks over whatever the index lookup returned.
+    """
+
+    def __init__(self, orders: list[JobOrder]) -> None:
+        import numpy as np
+
+        self.orders = orders
+        self.issue = np.array([o.issue_date[:10] for o in orders], dtype="U10")
+        self.required = np.array([o.required_date[:10] for o in orders], dtype="U10")
+        self.status = np.array([str(o.status) for o in orders], dtype=object)
+        self.client = np.array([o.client_code for o in orders], dtype=object)
+        self.local_export = np.array(
+            [o.local_export.casefold() for o in orders], dtype=object
+        )
+        self.issue_order = np.argsort(self.issue, kind="stable")
+        self.issue_sorted = self.issue[self.issue_order]
+        self.by_status = self._group(self.status)
+        self.by_client = self._group(self.client)
+
+    @staticmethod
+    def _group(column: np.ndarray) -> dict[str, np.ndarray]:
+        import numpy as np
+
+        groups: dict[str, list[int]] = {}
+        for position, value in enumerate(column):
+            groups.setdefault(value, []).append(position)
+        return {value: np.array(p, dtype=np.intp) for value, p in groups.items()}
+
+    def lookup(self, groups: dict[str, np.ndarray], values: list[str]) -> np.ndarray:
+        import numpy as np
+
+        found = [groups[v] for v in values if v in groups]
+        return np.sort(np.concatenate(found)) if found else np.array([], np.intp)
+
+    def issue_range(self, start: str, end: str) -> np.ndarray:
+        left = self.issue_sorted.searchsorted(start, side="left")
+        right = self.issue_sorted.searchsorted(end, side="right")
+        return self.issue_order[left:right]
+
+
+def _build_query_index() -> OrderQueryIndex:
+    return OrderQueryIndex(list(iter_all_job_orders()))
+
+
+def _query_sources() -> list[Path]:
+    return with_archives(JOB_ORDER_FILE, JOB_ORDER_REFS_FILE)
+
+
+def load_query_index() -> OrderQueryIndex:
+    # Not patched on writes: a rebuild reads the already-patched job order
+    # records, not the workbooks.
+    return cached("order_query", _query_sources(), _build_query_index)
+
+
+def _iso_date(value: Any, field: str) -> str:
+    try:
+        return date.fromisoformat(str(value)).isoformat()
+    except ValueError:
+        raise ValueError(f"{field} must be a YYYY-MM-DD date") from None
+
+
+def _values(value: Any) -> list[str]:
+    """A filter value given once, comma-separated, or as a list."""
+    if value in (None, ""):
+        return []
+    items = value if isinstance(value, (list, tuple)) else [value]
+    return [part.strip() for item in items for part in str(item).split(",") if part]
+
+
+def _flag(value: Any, field: str) -> bool | None:
+    if value in (None, ""):
+        return None
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes"):
+        return True
+    if text in ("0", "false", "no"):
+        return False
+    raise ValueError(f"{field} must be true or false")
+
+
+def _predicates(
+    index: OrderQueryIndex, filters: dict[str, Any], today: str
+) -> list[Predicate]:
+    import numpy as np
+
+    predicates: list[Predicate] = []
+
+    statuses = _values(filters.get("status"))
+    for status in statuses:
+        if status not in {s.value for s in Status}:
+            raise ValueError(f"Unknown status: {status}")
+    if statuses:
+        predicates.append(
+            (
+                "status",
+                lambda p: np.isin(index.status[p], statuses),
+                index.lookup(index.by_status, statuses),
+            )
+        )
+
+    clients = _values(filters.get("client_code"))
+    if clients:
+        predicates.append(
+            (
+                "client_code",
+                lambda p: np.isin(index.client[p], clients),
+                index.lookup(index.by_client, clients),
+            )
+        )
+
+    issue_from = filters.get("issue_from")
+    issue_to = filters.get("issue_to")
+    if issue_from or issue_to:
+        issue_start = (
+            _iso_date(issue_from, "issue_from") if issue_from else _LOWEST_DATE
+        )
+        issue_end = _iso_date(issue_to, "issue_to") if issue_to else _HIGHEST_DATE
+        predicates.append(
+            (
+                "issue_date",
+                lambda p: (index.issue[p] >= issue_start)
+                & (index.issue[p] <= issue_end),
+                index.issue_range(issue_start, issue_end),
+            )
+        )
+
+    required_from = filters.get("required_from")
+    required_to = filters.get("required_to")
+    if required_from or required_to:
+        required_start = (
+            _iso_date(required_from, "required_from") if required_from else _LOWEST_DATE
+        )
+        required_end = (
+            _iso_date(required_to, "required_to") if required_to else _HIGHEST_DATE
+        )
+        predicates.append(
+            (
+                "required_date",
+                lambda p: (index.required[p] >= required_start)
+                & (index.required[p] <= required_end),
+                None,
+            )
+        )
+
+    local_export = str(filters.get("local_export") or "").strip().casefold()
+    if local_export:
+        predicates.append(
+            (
+                "local_export",
+                lambda p: index.local_export[p] == local_export,
+                None,
+            )
+        )
+
+    overdue = _flag(filters.get("overdue"), "overdue")
+    if overdue is not None:
+
+        def _overdue(p: np.ndarray) -> np.ndarray:
+            late = (index.required[p] != "") & (index.required[p] < today)
+            return (late & np.isin(index.status[p], OPEN_STATUSES)) == overdue
+
+        predicates.append(("overdue", _overdue, None))
+
+    return predicates
+
+
+def query_orders(
+    filters: dict[str, Any] | None = None,
+    limit: int | None = None,
+    today: date | None = None,
+) -> tuple[list[dict[str, Any]], str]:
+    """Job orders matching every filter, by issue date, plus the plan used.
+
+    Filters: ``issue_from``/``issue_to`` and ``required_from``/``required_to``
+    (inclusive YYYY-MM-DD), ``status`` and ``client_code`` (one or several),
+    ``local_export``, and ``overdue`` (past required_date and still open).
+    ``limit`` keeps the first N matches.
+
+    The planner drives from the indexed predicate that selects the fewest
+    rows and applies the rest as masks over those rows. With no indexed
+    predicate it scans every order.
+    """
+    import numpy as np
+
+    if limit is not None and limit < 0:
+        raise ValueError("limit must not be negative")
+    index = load_query_index()
+    predicates = _predicates(index, filters or {}, (today or date.today()).isoformat())
+    indexed = [p for p in predicates if p[2] is not None]
+    if indexed:
+        driver = min(indexed, key=lambda p: len(p[2]))
+        positions = driver[2]
+        steps = [f"index {driver[0]} -> {len(positions)}"]
+        predicates.remove(driver)
+    else:
+        positions = np.arange(len(index.orders))
+        steps = [f"scan -> {len(positions)}"]
+    if predicates:
+        for _, mask, _ in predicates:
+            positions = positions[mask(positions)]
+        labels = ", ".join(label for label, _, _ in predicates)
+        steps.append(f"filter {labels} -> {len(positions)}")
+
+    positions = positions[np.argsort(index.issue[positions], kind="stable")]
+    if limit is not None:
+        positions = positions[:limit]
+    return [order_summary(index.orders[p]) for p in positions], "; ".join(steps)
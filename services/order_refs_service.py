@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+from db import (
+    DELIVERY_ORDER_FILE,
+    JOB_ORDER_FILE,
+    JOB_ORDER_REFS_FILE,
+    CACHE_LOCK,
+    append_rows,
+    cached,
+    iter_rows,
+    json_loads_list,
+    now_timestamp,
+    patch_cached,
+    read_header,
+    read_table,
+    write_table,
+    writing,
+)
+from records import JobOrder, Status, clean_str
+from services.events import (
+    ORDER_CONFIRMED,
+    ORDER_CREATED,
+    ORDER_STATUS_CHANGED,
+    subscribe,
+)
+from services.order_service import (
+    JOB_ORDER_COLUMNS,
+    JOB_ORDER_REF_COLUMNS,
+    REF_CLIENT_PO,
+    REF_SUPPLIER_DO,
+    build_ref_rows,
+)
+
+# Columns that used to hold JSON-encoded lists before the refs table existed.
+LEGACY_LIST_COLUMNS = {
+    "client_po_list": REF_CLIENT_PO,
+    "do_to_supplier_list": REF_SUPPLIER_DO,
+}
+
+_EMPTY: dict[str, tuple[str, ...]] = {}
+
+
+def _build_ref_index(path: Path) -> dict[str, Any]:
+    by_jo: dict[str, dict[str, list[tuple[int, str]]]] = defaultdict(
+        lambda: defaultdict(list)
+    )
+    for row in iter_rows(path, columns=JOB_ORDER_REF_COLUMNS):
+        value = clean_str(row["ref_value"])
+        if not value:
+            continue
+        try:
+            seq = int(row["seq"])
+        except (TypeError, ValueError):
+            seq = 0
+        by_jo[clean_str(row["jo_number"])][clean_str(row["ref_type"])].append(
+            (seq, value)
+        )
+
+    refs: dict[str, dict[str, tuple[str, ...]]] = {}
+    by_value: dict[tuple[str, str], list[str]] = defaultdict(list)
+    for jo_number, groups in by_jo.items():
+        refs[jo_number] = {}
+        for ref_type, values in groups.items():
+            ordered = tuple(value for _, value in sorted(values))
+            refs[jo_number][ref_type] = ordered
+            for value in ordered:
+                by_value[(ref_type, value.casefold())].append(jo_number)
+    return {"by_jo": refs, "by_value": dict(by_value)}
+
+
+def _ref_index_sources() -> list[Path]:
+    return [JOB_ORDER_REFS_FILE]
+
+
+def load_ref_index(path: Path | None = None) -> dict[str, Any]:
+    """Refs grouped per JO plus a reverse index ``(ref_type, value) -> JOs``.
+
+    ``path`` defaults to the hot refs table; pass an archive copy to read that.
+    """
+    sources = [path] if path is not None else _ref_index_sources()
+    return cached("job_order_refs", sources, lambda: _build_ref_index(sources[0]))
+
+
+def refs_for(jo_number: str) -> dict[str, tuple[str, ...]]:
+    return load_ref_index()["by_jo"].get(str(jo_number), _EMPTY)
+
+
+def find_orders_by_ref(value: str, ref_type: str = REF_CLIENT_PO) -> list[str]:
+    """JO numbers carrying ``value`` (case-insensitive), e.g. a client PO."""
+    key = (ref_type, str(value).strip().casefold())
+    index = load_ref_index()
+    with CACHE_LOCK:
+        return list(index["by_value"].get(key, ()))
+
+
+def _build_job_orders(jo_path: Path, refs_path: Path) -> dict[str, JobOrder]:
+    by_jo = load_ref_index(refs_path)["by_jo"]
+    orders = {}
+    for row in iter_rows(jo_path, columns=JOB_ORDER_COLUMNS):
+        refs = by_jo.get(clean_str(row["jo_number"]), _EMPTY)
+        row["client_po_list"] = refs.get(REF_CLIENT_PO, ())
+        row["do_to_supplier_list"] = refs.get(REF_SUPPLIER_DO, ())
+        order = JobOrder.from_row(row)
+        orders[order.jo_number] = order
+    return orders
+
+
+def _job_order_sources() -> list[Path]:
+    return [JOB_ORDER_FILE, JOB_ORDER_REFS_FILE]
+
+
+def load_job_orders(
+    jo_path: Path | None = None, refs_path: Path | None = None
+) -> dict[str, JobOrder]:
+    """All job orders as records keyed by JO number, in storage order.
+
+    List fields are joined from the refs table. Defaults to the hot tables.
+    """
+    sources = _job_order_sources()
+    if jo_path is not None and refs_path is not None:
+        sources = [jo_path, refs_path]
+    return cached("job_orders", sources, lambda: _build_job_orders(*sources))
+
+
+@subscribe(ORDER_CREATED)
+def _on_order_created(
+    order: dict[str, Any],
+    client_po_list: list[str],
+    do_to_supplier_list: list[str],
+    **_: Any,
+) -> None:
+    jo_number = order["jo_number"]
+    pairs = ((REF_CLIENT_PO, client_po_list), (REF_SUPPLIER_DO, do_to_supplier_list))
+    groups = {ref_type: tuple(values) for ref_type, values in pairs if values}
+
+    def _add_refs(index: dict[str, Any]) -> None:
+        index["by_jo"][jo_number] = groups
+        for ref_type, values in groups.items():
+            for value in values:
+                key = (ref_type, value.casefold())
+                index["by_value"].setdefault(key, []).append(jo_number)
+
+    def _add_order(orders: dict[str, JobOrder]) -> None:
+        row = dict(order, client_po_list=client_po_list)
+        row.update(do_to_supplier_list=do_to_supplier_list)
+        orders[jo_number] = JobOrder.from_row(row)
+
+    patch_cached("job_order_refs", _ref_index_sources(), _add_refs)
+    patch_cached("job_orders", _job_order_sources(), _add_order)
+
+
+@subscribe(ORDER_CONFIRMED)
+def _on_order_confirmed(
+    jo_number: str, delivery: dict[str, Any], updated_at: str, **_: Any
+) -> None:
+    def _confirm(orders: dict[str, JobOrder]) -> None:
+        order = orders[jo_number]
+        order.status = Status.DELIVERING
+        order.do_to_client_number = delivery["do_client_number"]
+        order.updated_at = updated_at
+
+    patch_cached("job_orders", _job_order_sources(), _confirm)
+
+
+@subscribe(ORDER_STATUS_CHANGED)
+def _on_status_changed(
+    jo_number: str, status: str, complete_date: str, updated_at: str, **_: Any
+) -> None:
+    def _set_status(orders: dict[str, JobOrder]) -> None:
+        order = orders[jo_number]
+        order.status = Status(status)
+        order.complete_date = complete_date
+        order.updated_at = updated_at
+
+    patch_cached("job_orders", _job_order_sources(), _set_status)
+
+
+def pending_list_migration() -> list[str]:
+    """Tables that still carry legacy list columns; header reads only."""
+    tables = []
+    if any(c in read_header(JOB_ORDER_FILE) for c in LEGACY_LIST_COLUMNS):
+        tables.append(JOB_ORDER_FILE.name)
+    if "client_po_list" in read_header(DELIVERY_ORDER_FILE):
+        tables.append(DELIVERY_ORDER_FILE.name)
+    return tables
+
+
+@writing()
+def migrate_list_fields() -> dict[str, int]:
+    """Move legacy JSON list cells into the refs table.
+
+    Idempotent: tables without the legacy columns are left untouched, and JOs
+    that already have refs are not duplicated. Run it once, before starting
+    the app (``python main.py migrate-list-fields``).
+    """
+    result = {"job_orders": 0, "refs": 0}
+    legacy = [c for c in LEGACY_LIST_COLUMNS if c in read_header(JOB_ORDER_FILE)]
+    if legacy:
+        job_order_df = read_table(JOB_ORDER_FILE)
+        existing = set(load_ref_index()["by_jo"])
+        now = now_timestamp()
+        ref_records: list[dict[str, Any]] = []
+        for _, row in job_order_df.iterrows():
+            jo_number = clean_str(row.get("jo_number"))
+            if not jo_number or jo_number in existing:
+                continue
+            result["job_orders"] += 1
+            for column in legacy:
+                values = json_loads_list(clean_str(row.get(column)))
+                ref_records += build_ref_rows(
+                    jo_number, LEGACY_LIST_COLUMNS[column], values, now
+                )
+        if ref_records:
+            append_rows(JOB_ORDER_REFS_FILE, ref_records, columns=JOB_ORDER_REF_COLUMNS)
+        result["refs"] = len(ref_records)
+        write_table(JOB_ORDER_FILE, job_order_df.drop(columns=legacy))
+
+    # A DO's PO list is the one on its JO, so the copy on the DO is dropped.
+    if "client_po_list" in read_header(DELIVERY_ORDER_FILE):
+        delivery_df = read_table(DELIVERY_ORDER_FILE)
+        write_table(DELIVERY_ORDER_FILE, delivery_df.drop(columns=["client_po_list"]))
+    return result
@@ -3,17 +3,19 @@ from __future__ import annotations
 from datetime import date
 from typing import Any
 
-import pandas as pd
-
 from db import (
     CLIENT_MASTER_FILE,
     ITEM_MASTER_FILE,
     JOB_ORDER_FILE,
     JOB_ORDER_ITEMS_FILE,
+    JOB_ORDER_REFS_FILE,
     DELIVERY_ORDER_FILE,
     DELIVERY_ORDER_ITEMS_FILE,
-    json_dumps_list,
-    json_loads_list,
+    archive_path,
+    as_str_list,
+    cached,
+    column_values,
+    iter_rows,
     next_number,
     now_timestamp,
     read_table,
@@ -21,20 +23,21 @@ from db import (
     append_rows,
     today_date,
     normalize_columns,
+    writing,
 )
+from records import clean_str
+from services.events import ORDER_CONFIRMED, ORDER_CREATED, publish
 
 
 JOB_ORDER_COLUMNS = [
     "id",
     "jo_number",
     "issue_date",
-    "client_po_list",
     "client_code",
     "client_name",
     "required_date",
     "local_export",
     "remark",
-    "do_to_supplier_list",
     "do_to_client_number",
     "status",
     "complete_date",
@@ -54,6 +57,19 @@ JOB_ORDER_ITEM_COLUMNS = [
     "updated_at",
 ]
 
+# List-valued JO fields (client POs, supplier DOs) live here, one row per value.
+JOB_ORDER_REF_COLUMNS = [
+    "id",
+    "jo_number",
+    "ref_type",
+    "ref_value",
+    "seq",
+    "created_at",
+]
+
+REF_CLIENT_PO = "client_po"
+REF_SUPPLIER_DO = "supplier_do"
+
 DELIVERY_ORDER_COLUMNS = [
     "id",
     "do_client_number",
@@ -64,7 +80,6 @@ DELIVERY_ORDER_COLUMNS = [
     "delivery_address",
     "client_pic",
     "client_contact",
-    "client_po_list",
     "remark",
     "status",
     "complete_date",
@@ -85,11 +100,35 @@ DELIVERY_ORDER_ITEM_COLUMNS = [
 ]
 
 
+class ValidationError(ValueError):
+    """Several input problems found in one pass; ``errors`` lists each one."""
+
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
 def _require(value: Any, field: str) -> None:
     if value in (None, "", []):
         raise ValueError(f"Missing required field: {field}")
 
 
+def build_ref_rows(
+    jo_number: str, ref_type: str, values: list[str], now: str
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": f"jo-{jo_number}-{ref_type}-{seq}",
+            "jo_number": jo_number,
+            "ref_type": ref_type,
+            "ref_value": value,
+            "seq": seq,
+            "created_at": now,
+        }
+        for seq, value in enumerate(values, start=1)
+    ]
+
+
 def _load_client_snapshot(client_code: str) -> dict[str, str]:
     df = read_table(CLIENT_MASTER_FILE)
     if df.empty:
@@ -110,21 +149,72 @@ def _load_client_snapshot(client_code: str) -> dict[str, str]:
     }
 
 
-def _load_item_description(item_code: str) -> str:
-    df = read_table(ITEM_MASTER_FILE)
-    if df.empty:
-        return ""
-    df = normalize_columns(df)
-    code_col = "item_code" if "item_code" in df.columns else "code"
-    if code_col not in df.columns:
-        return ""
-    row = df[df[code_col].astype(str) == str(item_code)]
-    if row.empty:
-        return ""
-    record = row.iloc[0].to_dict()
-    return str(record.get("item_description", record.get("description", "")))
+def _build_item_descriptions() -> dict[str, str]:
+    descriptions: dict[str, str] = {}
+    for row in iter_rows(ITEM_MASTER_FILE):
+        row = {str(k).strip().lower(): v for k, v in row.items()}
+        code = row.get("item_code", row.get("code"))
+        if code is None:
+            continue
+        description = row.get("item_description", row.get("description", ""))
+        descriptions.setdefault(str(code), clean_str(description))
+    return descriptions
+
+
+def load_item_descriptions() -> dict[str, str]:
+    """Item master as ``item_code -> description``, first row per code."""
+    return cached("item_master", [ITEM_MASTER_FILE], _build_item_descriptions)
 
 
+def _validate_items(items_input: list[Any]) -> list[str]:
+    """Check every line at once; returns each line's item description.
+
+    Raises ``ValidationError`` listing all bad lines. Descriptions left blank
+    are filled from the item master in one lookup over the whole order.
+    """
+    import pandas as pd
+
+    if not all(isinstance(item, dict) for item in items_input):
+        raise ValueError("items must be a list of objects")
+    frame = pd.DataFrame.from_records(items_input).reindex(
+        columns=["item_code", "item_description", "width", "length", "qty"]
+    )
+    blank = frame.isna() | (frame.astype(str).apply(lambda c: c.str.strip()) == "")
+    problems: list[tuple[int, int, str]] = []
+
+    def _flag(mask: pd.Series, order: int, message: str) -> None:
+        for pos in mask[mask].index:
+            problems.append((pos, order, message.format(line=pos + 1)))
+
+    _flag(blank["item_code"], 0, "Missing required field: items[{line}].item_code")
+    _flag(blank["qty"], 1, "Missing required field: items[{line}].qty")
+    qty = pd.to_numeric(frame["qty"], errors="coerce")
+    _flag(
+        ~blank["qty"] & ~(qty > 0),
+        1,
+        "items[{line}].qty must be a positive number",
+    )
+    for order, field in enumerate(("width", "length"), start=2):
+        size = pd.to_numeric(frame[field], errors="coerce")
+        _flag(
+            ~blank[field] & ~(size >= 0),
+            order,
+            f"items[{{line}}].{field} must be a non-negative number",
+        )
+    if problems:
+        raise ValidationError([message for *_, message in sorted(problems)])
+
+    descriptions = frame["item_description"].where(~blank["item_description"], "")
+    missing = blank["item_description"]
+    if missing.any():
+        found = (
+            frame.loc[missing, "item_code"].astype(str).map(load_item_descriptions())
+        )
+        descriptions[missing] = found.fillna("")
+    return [str(value) for value in descriptions]
+
+
+@writing()
 def create_order_draft(payload: dict[str, Any]) -> dict[str, Any]:
     _require(payload.get("client_code"), "client_code")
     _require(payload.get("items"), "items")
@@ -138,26 +228,28 @@ def create_order_draft(payload: dict[str, Any]) -> dict[str, Any]:
     items_input = payload["items"]
     if not isinstance(items_input, list) or not items_input:
         raise ValueError("items must be a non-empty list")
+    descriptions = _validate_items(items_input)
 
     job_order_df = read_table(JOB_ORDER_FILE, columns=JOB_ORDER_COLUMNS)
-    year_two = f"{date.today().year % 100:02d}"
-    jo_number = next_number(job_order_df, "jo_number", "JO", year_two)
+    year = date.today().year
+    archived = column_values(archive_path(JOB_ORDER_FILE, year), "jo_number")
+    jo_number = next_number(
+        job_order_df, "jo_number", "JO", f"{year % 100:02d}", extra_values=archived
+    )
     now = now_timestamp()
 
-    client_po_list = payload.get("client_po_list") or []
-    do_to_supplier_list = payload.get("do_to_supplier_list") or []
+    client_po_list = as_str_list(payload.get("client_po_list") or [])
+    do_to_supplier_list = as_str_list(payload.get("do_to_supplier_list") or [])
 
     order_record = {
         "id": f"jo-{jo_number}",
         "jo_number": jo_number,
         "issue_date": today_date(),
-        "client_po_list": json_dumps_list(client_po_list),
         "client_code": client_code,
         "client_name": client_name,
         "required_date": payload["required_date"],
         "local_export": payload["local_export"],
         "remark": payload.get("remark", ""),
-        "do_to_supplier_list": json_dumps_list(do_to_supplier_list),
         "do_to_client_number": "",
         "status": "Preparing",
         "complete_date": "",
@@ -166,18 +258,14 @@ def create_order_draft(payload: dict[str, Any]) -> dict[str, Any]:
     }
 
     item_records: list[dict[str, Any]] = []
-    for idx, item in enumerate(items_input, start=1):
-        _require(item.get("item_code"), f"items[{idx}].item_code")
-        _require(item.get("qty"), f"items[{idx}].qty")
-        item_code = str(item["item_code"])
-        item_description = str(
-            item.get("item_description") or _load_item_description(item_code)
-        )
+    for idx, (item, item_description) in enumerate(
+        zip(items_input, descriptions), start=1
+    ):
         item_records.append(
             {
                 "id": f"jo-{jo_number}-item-{idx}",
                 "jo_number": jo_number,
-                "item_code": item_code,
+                "item_code": str(item["item_code"]),
                 "item_description": item_description,
                 "width": item.get("width", ""),
                 "length": item.get("length", ""),
@@ -189,24 +277,29 @@ def create_order_draft(payload: dict[str, Any]) -> dict[str, Any]:
 
     append_rows(JOB_ORDER_FILE, [order_record], columns=JOB_ORDER_COLUMNS)
     append_rows(JOB_ORDER_ITEMS_FILE, item_records, columns=JOB_ORDER_ITEM_COLUMNS)
-
-    def _clean(value: Any) -> Any:
-        if pd.isna(value):
-            return ""
-        return value
-
-    cleaned_items = [{k: _clean(v) for k, v in item.items()} for item in item_records]
+    ref_records = build_ref_rows(jo_number, REF_CLIENT_PO, client_po_list, now)
+    ref_records += build_ref_rows(jo_number, REF_SUPPLIER_DO, do_to_supplier_list, now)
+    if ref_records:
+        append_rows(JOB_ORDER_REFS_FILE, ref_records, columns=JOB_ORDER_REF_COLUMNS)
+    publish(
+        ORDER_CREATED,
+        order=order_record,
+        items=item_records,
+        client_po_list=client_po_list,
+        do_to_supplier_list=do_to_supplier_list,
+    )
 
     return {
         "jo_number": jo_number,
         "status": "Preparing",
-        "issue_date": _clean(order_record["issue_date"]),
-        "client_po_list": json_loads_list(order_record["client_po_list"]),
-        "do_to_supplier_list": json_loads_list(order_record["do_to_supplier_list"]),
-        "items": cleaned_items,
+        "issue_date": order_record["issue_date"],
+        "client_po_list": client_po_list,
+        "do_to_supplier_list": do_to_supplier_list,
+        "items": item_records,
     }
 
 
+@writing()
 def confirm_order(jo_number: str) -> dict[str, Any]:
     job_order_df = read_table(JOB_ORDER_FILE, columns=JOB_ORDER_COLUMNS)
     if job_order_df.empty:
@@ -218,9 +311,18 @@ def confirm_order(jo_number: str) -> dict[str, Any]:
     if job_order.get("status") != "Preparing":
         raise ValueError("Only Preparing orders can be confirmed")
 
-    year_two = f"{date.today().year % 100:02d}"
+    year = date.today().year
     delivery_df = read_table(DELIVERY_ORDER_FILE, columns=DELIVERY_ORDER_COLUMNS)
-    do_number = next_number(delivery_df, "do_client_number", "DO", year_two)
+    archived = column_values(
+        archive_path(DELIVERY_ORDER_FILE, year), "do_client_number"
+    )
+    do_number = next_number(
+        delivery_df,
+        "do_client_number",
+        "DO",
+        f"{year % 100:02d}",
+        extra_values=archived,
+    )
     now = now_timestamp()
 
     client_code = str(job_order["client_code"])
@@ -236,7 +338,6 @@ def confirm_order(jo_number: str) -> dict[str, Any]:
         "delivery_address": client_snapshot["delivery_address"],
         "client_pic": client_snapshot["client_pic"],
         "client_contact": client_snapshot["client_contact"],
-        "client_po_list": job_order.get("client_po_list", "[]"),
         "remark": job_order.get("remark", ""),
         "status": "Delivering",
         "complete_date": "",
@@ -271,17 +372,17 @@ def confirm_order(jo_number: str) -> dict[str, Any]:
     append_rows(
         DELIVERY_ORDER_ITEMS_FILE, delivery_items, columns=DELIVERY_ORDER_ITEM_COLUMNS
     )
-
-    def _clean(value: Any) -> Any:
-        if pd.isna(value):
-            return ""
-        return value
-
-    cleaned_items = [{k: _clean(v) for k, v in item.items()} for item in delivery_items]
+    publish(
+        ORDER_CONFIRMED,
+        jo_number=str(jo_number),
+        delivery=delivery_record,
+        items=delivery_items,
+        updated_at=now,
+    )
 
     return {
         "do_client_number": do_number,
-        "client_snapshot": {k: _clean(v) for k, v in client_snapshot.items()},
+        "client_snapshot": client_snapshot,
         "status": "Delivering",
-        "items": cleaned_items,
+        "items": delivery_items,
     }
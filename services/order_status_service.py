@@ -8,10 +8,13 @@ from db import (
     now_timestamp,
     read_table,
     update_rows,
+    writing,
 )
+from services.events import ORDER_STATUS_CHANGED, publish
 from services.order_service import JOB_ORDER_COLUMNS, DELIVERY_ORDER_COLUMNS
 
 
+@writing()
 def complete_order(jo_number: str) -> dict[str, Any]:
     job_order_df = read_table(JOB_ORDER_FILE, columns=JOB_ORDER_COLUMNS)
     if job_order_df.empty:
@@ -36,10 +39,18 @@ def complete_order(jo_number: str) -> dict[str, Any]:
             delivery_df.loc[dmask, "complete_date"] = now.split("T")[0]
             delivery_df.loc[dmask, "updated_at"] = now
             update_rows(DELIVERY_ORDER_FILE, delivery_df)
+    publish(
+        ORDER_STATUS_CHANGED,
+        jo_number=str(jo_number),
+        status="Completed",
+        complete_date=now.split("T")[0],
+        updated_at=now,
+    )
 
     return {"jo_number": jo_number, "status": "Completed"}
 
 
+@writing()
 def cancel_order(jo_number: str) -> dict[str, Any]:
     job_order_df = read_table(JOB_ORDER_FILE, columns=JOB_ORDER_COLUMNS)
     if job_order_df.empty:
@@ -65,5 +76,12 @@ def cancel_order(jo_number: str) -> dict[str, Any]:
             delivery_df.loc[dmask, "complete_date"] = now.split("T")[0]
             delivery_df.loc[dmask, "updated_at"] = now
             update_rows(DELIVERY_ORDER_FILE, delivery_df)
+    publish(
+        ORDER_STATUS_CHANGED,
+        jo_number=str(jo_number),
+        status="Canceled",
+        complete_date=now.split("T")[0],
+        updated_at=now,
+    )
 
     return {"jo_number": jo_number, "status": "Canceled"}
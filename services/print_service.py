@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
+
+from services.delivery_service import (
+    delivery_payload,
+    find_delivery_orders,
+    load_delivery_items,
+)
+
+MAX_RENDERED = 2000
+
+# (do_client_number, updated_at) -> rendered sheet. Any change to a DO bumps
+# its updated_at, so an entry never needs invalidating; old ones age out.
+_RENDERED: OrderedDict[tuple[str, str], str] = OrderedDict()
+# Guards _RENDERED across request threads; rendering happens outside it.
+_RENDERED_LOCK = threading.Lock()
+
+
+def render_delivery_orders(
+    do_numbers: Iterable[str], render: Callable[[dict[str, Any]], str]
+) -> tuple[list[str], list[str]]:
+    """Printable sheets for ``do_numbers`` and the numbers that were not found.
+
+    ``render`` turns a ``get_delivery_order`` payload into one DO's markup.
+    Sheets are reused while the DO's ``updated_at`` is unchanged, and items
+    are only read for DOs that have to be rendered afresh.
+    """
+    do_numbers = list(dict.fromkeys(str(number) for number in do_numbers))
+    headers = find_delivery_orders(do_numbers)
+    missing = [number for number in do_numbers if number not in headers]
+
+    sheets: dict[str, str] = {}
+    stale = {}
+    with _RENDERED_LOCK:
+        for number, (record, items_path) in headers.items():
+            sheet = _RENDERED.get((number, record.updated_at))
+            if sheet is None:
+                stale[number] = (record, items_path)
+            else:
+                _RENDERED.move_to_end((number, record.updated_at))
+                sheets[number] = sheet
+
+    if stale:
+        items = load_delivery_items(stale)
+        for number, (record, _) in stale.items():
+            sheets[number] = render(delivery_payload(record, items[number]))
+        with _RENDERED_LOCK:
+            for number, (record, _) in stale.items():
+                _RENDERED[(number, record.updated_at)] = sheets[number]
+            while len(_RENDERED) > MAX_RENDERED:
+                _RENDERED.popitem(last=False)
+
+    return [sheets[n] for n in do_numbers if n in sheets], missing
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import re
+import heapq
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Iterable
+
+from db import (
+    JOB_ORDER_FILE,
+    JOB_ORDER_ITEMS_FILE,
+    JOB_ORDER_REFS_FILE,
+    CACHE_LOCK,
+    cached,
+    iter_rows,
+    patch_cached,
+)
+from records import JobOrder, clean_str
+from services.events import ORDER_CONFIRMED, ORDER_CREATED, subscribe
+from services.archive_service import (
+    find_job_order,
+    iter_all_job_orders,
+    with_archives,
+)
+
+# Exact hits on identifiers outrank hits on names and item codes.
+FIELD_WEIGHTS = {
+    "jo_number": 5,
+    "do_client_number": 5,
+    "client_po": 4,
+    "supplier_do": 3,
+    "client_name": 2,
+    "item_code": 1,
+}
+
+_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def _tokens(value: str) -> set[str]:
+    """The whole value plus its alphanumeric parts, case-folded."""
+    text = value.strip().casefold()
+    if not text:
+        return set()
+    tokens = {part for part in _SPLIT.split(text) if part}
+    tokens.add(text)
+    return tokens
+
+
+class SearchIndex:
+    """Inverted index from tokens to JO numbers with per-field weights."""
+
+    def __init__(self) -> None:
+        self.postings: dict[str, dict[str, int]] = defaultdict(dict)
+        self.vocabulary: list[str] = []
+        self._unsorted = 0
+
+    def add(self, jo_number: str, field: str, values: Iterable[str]) -> None:
+        weight = FIELD_WEIGHTS[field]
+        for value in values:
+            for token in _tokens(value):
+                posting = self.postings[token]
+                if not posting:
+                    self.vocabulary.append(token)
+                    self._unsorted += 1
+                posting[jo_number] = max(posting.get(jo_number, 0), weight)
+
+    def add_order(self, order: JobOrder) -> None:
+        self.add(order.jo_number, "jo_number", [order.jo_number])
+        self.add(order.jo_number, "do_client_number", [order.do_to_client_number])
+        self.add(order.jo_number, "client_po", order.client_po_list)
+        self.add(order.jo_number, "supplier_do", order.do_to_supplier_list)
+        self.add(order.jo_number, "client_name", [order.client_name])
+
+    def _matches(self, term: str) -> dict[str, int]:
+        """Score per JO for one query term; prefix hits count half."""
+        scores: dict[str, int] = {}
+        vocabulary = self.vocabulary
+        if self._unsorted:
+            # Timsort merges the appended tail in close to linear time.
+            vocabulary.sort()
+            self._unsorted = 0
+        for position in range(bisect_left(vocabulary, term), len(vocabulary)):
+            token = vocabulary[position]
+            if not token.startswith(term):
+                break
+            factor = 2 if token == term else 1
+            for jo_number, weight in self.postings[token].items():
+                scores[jo_number] = max(scores.get(jo_number, 0), weight * factor)
+        return scores
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[str, int]]:
+        """Top ``limit`` JO numbers matching every query term, best first."""
+        matches = [self._matches(t) for t in set(query.casefold().split())]
+        if not matches:
+            return []
+        matches.sort(key=len)
+        totals = matches[0]
+        for scores in matches[1:]:
+            totals = {jo: s + scores[jo] for jo, s in totals.items() if jo in scores}
+        return heapq.nsmallest(limit, totals.items(), key=lambda hit: (-hit[1], hit[0]))
+
+
+def _build_search_index() -> SearchIndex:
+    index = SearchIndex()
+    for order in iter_all_job_orders():
+        index.add_order(order)
+    for path in with_archives(JOB_ORDER_ITEMS_FILE):
+        for row in iter_rows(path, columns=["jo_number", "item_code"]):
+            index.add(
+                clean_str(row["jo_number"]), "item_code", [clean_str(row["item_code"])]
+            )
+    return index
+
+
+def _search_sources() -> list[Path]:
+    return with_archives(JOB_ORDER_FILE, JOB_ORDER_REFS_FILE, JOB_ORDER_ITEMS_FILE)
+
+
+def load_search_index() -> SearchIndex:
+    return cached("search_index", _search_sources(), _build_search_index)
+
+
+def search_orders(query: str, limit: int = 20) -> list[dict[str, Any]]:
+    """Ranked JO matches for ``query`` across JO/DO/PO numbers, names and items."""
+    results = []
+    # Searching sorts the vocabulary in place and walks postings that writers
+    # append to, so it runs under the lock.
+    index = load_search_index()
+    with CACHE_LOCK:
+        hits = index.search(query, limit)
+    for jo_number, score in hits:
+        order = find_job_order(jo_number)
+        if order is None:
+            continue
+        results.append(
+            {
+                "jo_number": order.jo_number,
+                "do_client_number": order.do_to_client_number,
+                "client_code": order.client_code,
+                "client_name": order.client_name,
+                "client_po_list": list(order.client_po_list),
+                "do_to_supplier_list": list(order.do_to_supplier_list),
+                "issue_date": order.issue_date,
+                "status": str(order.status),
+                "score": score,
+            }
+        )
+    return results
+
+
+@subscribe(ORDER_CREATED)
+def _on_order_created(
+    order: dict[str, Any],
+    items: list[dict[str, Any]],
+    client_po_list: list[str],
+    do_to_supplier_list: list[str],
+    **_: Any,
+) -> None:
+    jo_number = order["jo_number"]
+
+    def _add(index: SearchIndex) -> None:
+        index.add(jo_number, "jo_number", [jo_number])
+        index.add(jo_number, "client_po", client_po_list)
+        index.add(jo_number, "supplier_do", do_to_supplier_list)
+        index.add(jo_number, "client_name", [clean_str(order["client_name"])])
+        index.add(jo_number, "item_code", [clean_str(i["item_code"]) for i in items])
+
+    patch_cached("search_index", _search_sources(), _add)
+
+
+@subscribe(ORDER_CONFIRMED)
+def _on_order_confirmed(jo_number: str, delivery: dict[str, Any], **_: Any) -> None:
+    def _add(index: SearchIndex) -> None:
+        index.add(jo_number, "do_client_number", [delivery["do_client_number"]])
+
+    patch_cached("search_index", _search_sources(), _add)
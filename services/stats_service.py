@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Iterable
+
+from db import (
+    JOB_ORDER_FILE,
+    JOB_ORDER_ITEMS_FILE,
+    CACHE_LOCK,
+    cached,
+    invalidate,
+    iter_rows,
+    patch_cached,
+)
+from records import clean_str
+from services.events import (
+    ORDER_CONFIRMED,
+    ORDER_CREATED,
+    ORDER_STATUS_CHANGED,
+    subscribe,
+)
+from services.archive_service import iter_all_job_orders, with_archives
+
+OPEN_STATUSES = ("Preparing", "Delivering")
+
+
+def _qty(value: Any) -> float:
+    try:
+        return float(clean_str(value) or 0)
+    except ValueError:
+        return 0.0
+
+
+class OrderStats:
+    """Running aggregates over job orders, updated per status transition."""
+
+    def __init__(self) -> None:
+        self.by_status: Counter[str] = Counter()
+        self.on_time = 0
+        self.late = 0
+        self.open_qty: dict[tuple[str, str], float] = defaultdict(float)
+        # jo_number -> (status, (client_code, issue month), qty, required_date)
+        self.orders: dict[str, tuple[str, tuple[str, str], float, str]] = {}
+
+    def add(
+        self,
+        jo_number: str,
+        status: str,
+        client_code: str,
+        issue_date: str,
+        required_date: str,
+        qty: float,
+        complete_date: str = "",
+    ) -> None:
+        # Adding or moving a JO twice (a replayed event) must not count twice.
+        if jo_number in self.orders:
+            return
+        key = (client_code, issue_date[:7])
+        self.orders[jo_number] = (status, key, qty, required_date[:10])
+        self.by_status[status] += 1
+        if status in OPEN_STATUSES:
+            self.open_qty[key] += qty
+        elif status == "Completed":
+            self._count_delivery(required_date, complete_date)
+
+    def _count_delivery(self, required_date: str, complete_date: str) -> None:
+        if not required_date or not complete_date:
+            return
+        if complete_date[:10] <= required_date[:10]:
+            self.on_time += 1
+        else:
+            self.late += 1
+
+    def move(self, jo_number: str, status: str, complete_date: str = "") -> None:
+        old_status, key, qty, required_date = self.orders[jo_number]
+        if old_status == status:
+            return
+        self.orders[jo_number] = (status, key, qty, required_date)
+        self.by_status[old_status] -= 1
+        self.by_status[status] += 1
+        if old_status in OPEN_STATUSES and status not in OPEN_STATUSES:
+            self.open_qty[key] -= qty
+            if not self.open_qty[key]:
+                del self.open_qty[key]
+        if status == "Completed":
+            self._count_delivery(required_date, complete_date)
+
+    def summary(self) -> dict[str, Any]:
+        delivered = self.on_time + self.late
+        return {
+            "total": len(self.orders),
+            "by_status": {k: v for k, v in self.by_status.items() if v},
+            "deliveries": {
+                "on_time": self.on_time,
+                "late": self.late,
+                "on_time_rate": (
+                    round(self.on_time / delivered, 4) if delivered else None
+                ),
+            },
+            "open_qty": [
+                {"client_code": client, "month": month, "qty": qty}
+                for (client, month), qty in sorted(self.open_qty.items())
+            ],
+        }
+
+
+def _order_qty(items: Iterable[dict[str, Any]]) -> dict[str, float]:
+    totals: dict[str, float] = defaultdict(float)
+    for item in items:
+        totals[clean_str(item["jo_number"])] += _qty(item["qty"])
+    return totals
+
+
+def _build_stats() -> OrderStats:
+    stats = OrderStats()
+    qty: dict[str, float] = defaultdict(float)
+    for path in with_archives(JOB_ORDER_ITEMS_FILE):
+        for jo_number, total in _order_qty(
+            iter_rows(path, ["jo_number", "qty"])
+        ).items():
+            qty[jo_number] += total
+    for order in iter_all_job_orders():
+        stats.add(
+            order.jo_number,
+            str(order.status),
+            order.client_code,
+            order.issue_date,
+            order.required_date,
+            qty.get(order.jo_number, 0.0),
+            order.complete_date,
+        )
+    return stats
+
+
+def _stats_sources() -> list[Path]:
+    return with_archives(JOB_ORDER_FILE, JOB_ORDER_ITEMS_FILE)
+
+
+def get_order_stats(rebuild: bool = False) -> dict[str, Any]:
+    """KPI summary from running aggregates; ``rebuild`` recomputes from storage."""
+    if rebuild:
+        invalidate(name="order_stats")
+    stats = cached("order_stats", _stats_sources(), _build_stats)
+    with CACHE_LOCK:
+        return stats.summary()
+
+
+@subscribe(ORDER_CREATED)
+def _on_order_created(
+    order: dict[str, Any], items: list[dict[str, Any]], **_: Any
+) -> None:
+    def _add(stats: OrderStats) -> None:
+        stats.add(
+            order["jo_number"],
+            order["status"],
+            clean_str(order["client_code"]),
+            clean_str(order["issue_date"]),
+            clean_str(order["required_date"]),
+            sum(_qty(item["qty"]) for item in items),
+        )
+
+    patch_cached("order_stats", _stats_sources(), _add)
+
+
+@subscribe(ORDER_CONFIRMED)
+def _on_order_confirmed(jo_number: str, **_: Any) -> None:
+    patch_cached(
+        "order_stats", _stats_sources(), lambda s: s.move(jo_number, "Delivering")
+    )
+
+
+@subscribe(ORDER_STATUS_CHANGED)
+def _on_status_changed(
+    jo_number: str, status: str, complete_date: str, **_: Any
+) -> None:
+    patch_cached(
+        "order_stats",
+        _stats_sources(),
+        lambda s: s.move(jo_number, status, complete_date),
+    )
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from db import (
+    SUPPLIER_MASTER_FILE,
+    SUPPLIER_PO_FILE,
+    SUPPLIER_PO_ITEMS_FILE,
+    CACHE_LOCK,
+    append_rows,
+    cached,
+    iter_rows,
+    next_number,
+    now_timestamp,
+    patch_cached,
+    read_table,
+    today_date,
+    update_rows,
+    writing,
+)
+from records import SupplierPO, SupplierPOItem, clean_str
+from services.archive_service import find_job_order
+
+# Column names follow the supplier_po*.xlsx files that shipped with the project;
+# ``order_id`` holds the JO number the purchase order is raised for. The shipped
+# ``po_id``/``po_item_id`` keys are kept (filled with the supplier_po ids) so
+# rewriting a table never drops them.
+SUPPLIER_PO_COLUMNS = [
+    "po_id",
+    "supplier_po_id",
+    "supplier_po_no",
+    "supplier_code",
+    "order_id",
+    "issue_date",
+    "po_status",
+    "received_date",
+    "remark",
+    "created_at",
+    "updated_at",
+]
+
+SUPPLIER_PO_ITEM_COLUMNS = [
+    "po_item_id",
+    "po_id",
+    "supplier_po_item_id",
+    "supplier_po_no",
+    "order_id",
+    "order_item_id",
+    "item_code",
+    "item_description",
+    "qty",
+    "received_qty",
+    "item_remark",
+    "item_status",
+    "created_at",
+    "updated_at",
+]
+
+PO_OPEN = "OPEN"
+PO_PARTIAL = "PARTIAL"
+PO_RECEIVED = "RECEIVED"
+
+
+def _require(value: Any, field: str) -> None:
+    if value in (None, "", []):
+        raise ValueError(f"Missing required field: {field}")
+
+
+def _number(value: Any, field: str) -> float:
+    try:
+        return float(clean_str(value) or 0)
+    except ValueError:
+        raise ValueError(f"{field} must be a number") from None
+
+
+def _build_supplier_master() -> dict[str, dict[str, str]]:
+    suppliers = {}
+    for row in iter_rows(SUPPLIER_MASTER_FILE):
+        row = {str(k).strip().lower(): clean_str(v) for k, v in row.items()}
+        code = row.get("supplier_code") or row.get("code")
+        if code:
+            suppliers[code] = row
+    return suppliers
+
+
+def load_supplier_master() -> dict[str, dict[str, str]]:
+    """Supplier master keyed by supplier code (``supplier_code`` or ``code``)."""
+    return cached("supplier_master", [SUPPLIER_MASTER_FILE], _build_supplier_master)
+
+
+def get_supplier(supplier_code: str) -> dict[str, Any]:
+    supplier = load_supplier_master().get(str(supplier_code))
+    if supplier is None:
+        raise ValueError(f"Supplier code not found in masterlist: {supplier_code}")
+    return {
+        "supplier_code": str(supplier_code),
+        "supplier_name": supplier.get("supplier_name", ""),
+        "contact_person": supplier.get("contact_person", ""),
+        "contact_number": supplier.get("contact_number", ""),
+        "email": supplier.get("email", ""),
+        "address": supplier.get("address", ""),
+    }
+
+
+class SupplierPOIndex:
+    """Supplier POs by number, and PO numbers by JO, with their item rows."""
+
+    def __init__(self) -> None:
+        self.orders: dict[str, SupplierPO] = {}
+        self.items: dict[str, list[SupplierPOItem]] = defaultdict(list)
+        self.by_order: dict[str, list[str]] = defaultdict(list)
+
+    def add(self, order: SupplierPO) -> None:
+        self.orders[order.supplier_po_no] = order
+        if order.order_id:
+            self.by_order[order.order_id].append(order.supplier_po_no)
+
+    def relink(self, po_no: str, old_jo: str, new_jo: str) -> None:
+        if old_jo and po_no in self.by_order.get(old_jo, []):
+            self.by_order[old_jo].remove(po_no)
+        self.by_order[new_jo].append(po_no)
+
+
+def _build_po_index() -> SupplierPOIndex:
+    index = SupplierPOIndex()
+    for row in iter_rows(SUPPLIER_PO_FILE, columns=SUPPLIER_PO_COLUMNS):
+        index.add(SupplierPO.from_row(row))
+    for row in iter_rows(SUPPLIER_PO_ITEMS_FILE, columns=SUPPLIER_PO_ITEM_COLUMNS):
+        item = SupplierPOItem.from_row(row)
+        index.items[item.supplier_po_no].append(item)
+    return index
+
+
+def _po_sources() -> list[Path]:
+    return [SUPPLIER_PO_FILE, SUPPLIER_PO_ITEMS_FILE]
+
+
+def load_po_index() -> SupplierPOIndex:
+    return cached("supplier_pos", _po_sources(), _build_po_index)
+
+
+def _po_payload(index: SupplierPOIndex, po_no: str) -> dict[str, Any]:
+    data = index.orders[po_no].to_dict()
+    data["items"] = [item.to_dict() for item in index.items.get(po_no, [])]
+    return data
+
+
+def get_supplier_po(supplier_po_no: str) -> dict[str, Any]:
+    index = load_po_index()
+    with CACHE_LOCK:
+        if str(supplier_po_no) not in index.orders:
+            raise ValueError(f"Supplier PO not found: {supplier_po_no}")
+        return _po_payload(index, str(supplier_po_no))
+
+
+def list_supplier_pos_for_order(jo_number: str) -> list[dict[str, Any]]:
+    """Supplier POs raised for a JO, via the JO -> PO index."""
+    index = load_po_index()
+    with CACHE_LOCK:
+        return [
+            _po_payload(index, po_no)
+            for po_no in index.by_order.get(str(jo_number), [])
+        ]
+
+
+def _check_job_order(jo_number: str) -> None:
+    if find_job_order(jo_number) is None:
+        raise ValueError(f"JO number not found: {jo_number}")
+
+
+@writing()
+def create_supplier_po(payload: dict[str, Any]) -> dict[str, Any]:
+    _require(payload.get("supplier_code"), "supplier_code")
+    _require(payload.get("items"), "items")
+    supplier_code = str(payload["supplier_code"])
+    suppliers = load_supplier_master()
+    # An empty master (as shipped) does not block POs; a populated one must match.
+    if suppliers and supplier_code not in suppliers:
+        raise ValueError(f"Supplier code not found in masterlist: {supplier_code}")
+
+    items_input = payload["items"]
+    if not isinstance(items_input, list) or not items_input:
+        raise ValueError("items must be a non-empty list")
+
+    jo_number = str(payload.get("jo_number") or "")
+    if jo_number:
+        _check_job_order(jo_number)
+
+    index = load_po_index()
+    po_no = str(payload.get("supplier_po_no") or "")
+    if not po_no:
+        year_two = f"{date.today().year % 100:02d}"
+        po_no = next_number(
+            None, "supplier_po_no", "SPO", year_two, extra_values=index.orders
+        )
+    elif po_no in index.orders:
+        raise ValueError(f"Supplier PO already exists: {po_no}")
+    now = now_timestamp()
+
+    po_record = {
+        "po_id": f"spo-{po_no}",
+        "supplier_po_id": f"spo-{po_no}",
+        "supplier_po_no": po_no,
+        "supplier_code": supplier_code,
+        "order_id": jo_number,
+        "issue_date": payload.get("issue_date") or today_date(),
+        "po_status": PO_OPEN,
+        "received_date": "",
+        "remark": payload.get("remark", ""),
+        "created_at": now,
+        "updated_at": now,
+    }
+    item_records: list[dict[str, Any]] = []
+    for idx, item in enumerate(items_input, start=1):
+        if not isinstance(item, dict):
+            raise ValueError(f"items[{idx}] must be an object")
+        _require(item.get("item_code"), f"items[{idx}].item_code")
+        _require(item.get("qty"), f"items[{idx}].qty")
+        if _number(item["qty"], f"items[{idx}].qty") <= 0:
+            raise ValueError(f"items[{idx}].qty must be greater than 0")
+        item_records.append(
+            {
+                "po_item_id": f"spo-{po_no}-item-{idx}",
+                "po_id": f"spo-{po_no}",
+                "supplier_po_item_id": f"spo-{po_no}-item-{idx}",
+                "supplier_po_no": po_no,
+                "order_id": jo_number,
+                "order_item_id": item.get("order_item_id", ""),
+                "item_code": str(item["item_code"]),
+                "item_description": item.get("item_description", ""),
+                "qty": item["qty"],
+                "received_qty": 0,
+                "item_remark": item.get("item_remark", ""),
+                "item_status": PO_OPEN,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+
+    append_rows(SUPPLIER_PO_FILE, [po_record], columns=SUPPLIER_PO_COLUMNS)
+    append_rows(SUPPLIER_PO_ITEMS_FILE, item_records, columns=SUPPLIER_PO_ITEM_COLUMNS)
+
+    def _add(index: SupplierPOIndex) -> None:
+        index.add(SupplierPO.from_row(po_record))
+        index.items[po_no] = [SupplierPOItem.from_row(r) for r in item_records]
+
+    patch_cached("supplier_pos", _po_sources(), _add)
+    return get_supplier_po(po_no)
+
+
+@writing()
+def link_supplier_po(supplier_po_no: str, jo_number: str) -> dict[str, Any]:
+    _require(jo_number, "jo_number")
+    _check_job_order(jo_number)
+    po_df = read_table(SUPPLIER_PO_FILE, columns=SUPPLIER_PO_COLUMNS)
+    mask = po_df["supplier_po_no"].astype(str) == str(supplier_po_no)
+    if po_df.empty or not mask.any():
+        raise ValueError(f"Supplier PO not found: {supplier_po_no}")
+    old_jo = clean_str(po_df.loc[mask, "order_id"].iloc[0])
+    now = now_timestamp()
+    po_df.loc[mask, "order_id"] = jo_number
+    po_df.loc[mask, "updated_at"] = now
+    update_rows(SUPPLIER_PO_FILE, po_df)
+
+    items_df = read_table(SUPPLIER_PO_ITEMS_FILE, columns=SUPPLIER_PO_ITEM_COLUMNS)
+    imask = items_df["supplier_po_no"].astype(str) == str(supplier_po_no)
+    if imask.any():
+        items_df.loc[imask, "order_id"] = jo_number
+        items_df.loc[imask, "updated_at"] = now
+        update_rows(SUPPLIER_PO_ITEMS_FILE, items_df)
+
+    def _relink(index: SupplierPOIndex) -> None:
+        order = index.orders[str(supplier_po_no)]
+        order.order_id = jo_number
+        order.updated_at = now
+        for item in index.items.get(str(supplier_po_no), []):
+            item.order_id = jo_number
+            item.updated_at = now
+        index.relink(str(supplier_po_no), old_jo, jo_number)
+
+    patch_cached("supplier_pos", _po_sources(), _relink)
+    return get_supplier_po(supplier_po_no)
+
+
+@writing()
+def receive_supplier_po(
+    supplier_po_no: str, received: list[dict[str, Any]] | None = None
+) -> dict[str, Any]:
+    """Record goods received against a supplier PO.
+
+    ``received`` lists ``{"item_code", "qty"}`` deliveries; omit it to receive
+    every outstanding line in full.
+    """
+    if received is not None and not (
+        isinstance(received, list) and all(isinstance(e, dict) for e in received)
+    ):
+        raise ValueError("items must be a list of {item_code, qty}")
+    po_df = read_table(SUPPLIER_PO_FILE, columns=SUPPLIER_PO_COLUMNS)
+    mask = po_df["supplier_po_no"].astype(str) == str(supplier_po_no)
+    if po_df.empty or not mask.any():
+        raise ValueError(f"Supplier PO not found: {supplier_po_no}")
+    if po_df.loc[mask, "po_status"].iloc[0] == PO_RECEIVED:
+        raise ValueError("Supplier PO is already fully received")
+
+    items_df = read_table(SUPPLIER_PO_ITEMS_FILE, columns=SUPPLIER_PO_ITEM_COLUMNS)
+    lines = items_df.index[
+        items_df["supplier_po_no"].astype(str) == str(supplier_po_no)
+    ]
+    if not len(lines):
+        raise ValueError(f"Supplier PO has no items: {supplier_po_no}")
+
+    outstanding = {
+        idx: _number(items_df.at[idx, "qty"], "qty")
+        - _number(items_df.at[idx, "received_qty"], "received_qty")
+        for idx in lines
+    }
+    receipts: dict[Any, float] = defaultdict(float)
+    if received is None:
+        receipts.update(outstanding)
+    else:
+        for pos, entry in enumerate(received, start=1):
+            _require(entry.get("item_code"), f"items[{pos}].item_code")
+            qty = _number(entry.get("qty"), f"items[{pos}].qty")
+            if qty < 0:
+                raise ValueError(f"items[{pos}].qty must not be negative")
+            match = [
+                idx
+                for idx in lines
+                if str(items_df.at[idx, "item_code"]) == str(entry["item_code"])
+            ]
+            if not match:
+                raise ValueError(f"Item not on supplier PO: {entry['item_code']}")
+            receipts[match[0]] += qty
+    for idx, qty in receipts.items():
+        if qty > outstanding[idx]:
+            item_code = items_df.at[idx, "item_code"]
+            raise ValueError(f"Received qty exceeds outstanding for {item_code}")
+
+    now = now_timestamp()
+    for idx in lines:
+        done = _number(items_df.at[idx, "received_qty"], "received_qty")
+        done += receipts.get(idx, 0.0)
+        full = done >= _number(items_df.at[idx, "qty"], "qty")
+        items_df.at[idx, "received_qty"] = done
+        items_df.at[idx, "item_status"] = (
+            PO_RECEIVED if full else PO_PARTIAL if done else PO_OPEN
+        )
+        items_df.at[idx, "updated_at"] = now
+    line_statuses = {items_df.at[idx, "item_status"] for idx in lines}
+    if line_statuses == {PO_RECEIVED}:
+        status = PO_RECEIVED
+    elif line_statuses == {PO_OPEN}:
+        status = PO_OPEN
+    else:
+        status = PO_PARTIAL
+    po_df.loc[mask, "po_status"] = status
+    po_df.loc[mask, "received_date"] = today_date() if status == PO_RECEIVED else ""
+    po_df.loc[mask, "updated_at"] = now
+    update_rows(SUPPLIER_PO_ITEMS_FILE, items_df)
+    update_rows(SUPPLIER_PO_FILE, po_df)
+
+    def _receive(index: SupplierPOIndex) -> None:
+        po_no = str(supplier_po_no)
+        index.orders[po_no] = SupplierPO.from_row(po_df.loc[mask].iloc[0].to_dict())
+        index.items[po_no] = [
+            SupplierPOItem.from_row(items_df.loc[idx].to_dict()) for idx in lines
+        ]
+
+    patch_cached("supplier_pos", _po_sources(), _receive)
+    return get_supplier_po(supplier_po_no)
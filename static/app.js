@@ -269,6 +269,13 @@ async function initDashboard() {
       rowsEl.appendChild(tr);
     });
     countEl.textContent = res.length;
+
+    const printLink = qs("print-dos");
+    const delivering = res
+      .filter((row) => row.status === "Delivering" && row.do_client_number)
+      .map((row) => row.do_client_number);
+    printLink.hidden = delivering.length === 0;
+    printLink.href = `/delivery/print?do=${encodeURIComponent(delivering.join(","))}`;
   }
 
   qs("apply-filter").addEventListener("click", load);
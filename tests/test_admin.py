@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+import db
+from services import (
+    admin_service,
+    archive_service,
+    cache_service,
+    order_refs_service,
+    order_service,
+    search_service,
+    stats_service,
+    supplier_service,
+)
+
+
+def _setup_paths(tmp_path: Path) -> dict[str, Path]:
+    data_dir = tmp_path / "data"
+    master_dir = tmp_path / "master"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    master_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = {
+        "DATA_DIR": data_dir,
+        "MASTER_DIR": master_dir,
+        "JOB_ORDER_FILE": data_dir / "job_order.xlsx",
+        "JOB_ORDER_ITEMS_FILE": data_dir / "job_order_items.xlsx",
+        "JOB_ORDER_REFS_FILE": data_dir / "job_order_refs.xlsx",
+        "DELIVERY_ORDER_FILE": data_dir / "delivery_order.xlsx",
+        "DELIVERY_ORDER_ITEMS_FILE": data_dir / "delivery_order_items.xlsx",
+        "SUPPLIER_PO_FILE": data_dir / "supplier_po.xlsx",
+        "SUPPLIER_PO_ITEMS_FILE": data_dir / "supplier_po_items.xlsx",
+        "CLIENT_MASTER_FILE": master_dir / "client_master.xlsx",
+        "ITEM_MASTER_FILE": master_dir / "item_master.xlsx",
+        "SUPPLIER_MASTER_FILE": master_dir / "supplier_master.xlsx",
+    }
+
+    modules = (
+        db,
+        order_service,
+        order_refs_service,
+        archive_service,
+        search_service,
+        stats_service,
+        supplier_service,
+        cache_service,
+        admin_service,
+    )
+    for module in modules:
+        for name, path in paths.items():
+            if hasattr(module, name):
+                setattr(module, name, path)
+
+    return paths
+
+
+def _seed_master(paths: dict[str, Path]) -> None:
+    pd.DataFrame([{"client_code": "C001", "client_name": "Test Pte Ltd"}]).to_excel(
+        paths["CLIENT_MASTER_FILE"], index=False
+    )
+    pd.DataFrame(
+        [{"item_code": "00015", "item_description": "Fire Rated Pyran S 6mm"}]
+    ).to_excel(paths["ITEM_MASTER_FILE"], index=False)
+
+
+def test_table_and_cache_status_and_reload(tmp_path: Path) -> None:
+    paths = _setup_paths(tmp_path)
+    _seed_master(paths)
+    db.invalidate()
+
+    tables = {t["table"]: t for t in admin_service.table_status()}
+    assert tables["item_master"]["rows"] == 1
+    assert tables["job_order"]["exists"] is False
+
+    assert order_service.load_item_descriptions() == {"00015": "Fire Rated Pyran S 6mm"}
+    tables = {t["table"]: t for t in admin_service.table_status()}
+    assert tables["item_master"]["last_parse"]["rows"] == 1
+    caches = {c["name"]: c for c in admin_service.cache_status()}
+    assert caches["item_master"]["tables"] == ["item_master"]
+    assert caches["item_master"]["size_bytes"] > 0
+    assert caches["item_master"]["fresh"] is True
+
+    # As after someone edits the master in Excel.
+    pd.DataFrame(
+        [{"item_code": "00015", "item_description": "Edited by hand"}]
+    ).to_excel(paths["ITEM_MASTER_FILE"], index=False)
+    rebuilt = admin_service.reload_table("item_master")
+    assert [c["name"] for c in rebuilt] == ["item_master"]
+    assert order_service.load_item_descriptions()["00015"] == "Edited by hand"
+
+
+def test_storage_health_reports_lock(tmp_path: Path) -> None:
+    _setup_paths(tmp_path)
+
+    health = admin_service.storage_health()
+    assert health["ok"] is True
+    assert health["storage_lock"] == "free"
+    assert health["tables"]["job_order"] == "missing"
+
+    held, release = threading.Event(), threading.Event()
+
+    def _hold() -> None:
+        with db.STORAGE_LOCK:
+            held.set()
+            release.wait()
+
+    thread = threading.Thread(target=_hold)
+    thread.start()
+    held.wait()
+    try:
+        assert admin_service.storage_health()["storage_lock"] == "held"
+    finally:
+        release.set()
+        thread.join()
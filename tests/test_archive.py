@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+import db
+from services import (
+    archive_service,
+    dashboard_service,
+    delivery_service,
+    order_refs_service,
+    order_service,
+    order_status_service,
+    search_service,
+    stats_service,
+)
+
+
+def _setup_paths(tmp_path: Path) -> dict[str, Path]:
+    data_dir = tmp_path / "data"
+    master_dir = tmp_path / "master"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    master_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = {
+        "DATA_DIR": data_dir,
+        "MASTER_DIR": master_dir,
+        "JOB_ORDER_FILE": data_dir / "job_order.xlsx",
+        "JOB_ORDER_ITEMS_FILE": data_dir / "job_order_items.xlsx",
+        "JOB_ORDER_REFS_FILE": data_dir / "job_order_refs.xlsx",
+        "DELIVERY_ORDER_FILE": data_dir / "delivery_order.xlsx",
+        "DELIVERY_ORDER_ITEMS_FILE": data_dir / "delivery_order_items.xlsx",
+        "CLIENT_MASTER_FILE": master_dir / "client_master.xlsx",
+        "ITEM_MASTER_FILE": master_dir / "item_master.xlsx",
+    }
+
+    modules = (
+        db,
+        order_service,
+        order_status_service,
+        order_refs_service,
+        archive_service,
+        delivery_service,
+        search_service,
+        stats_service,
+    )
+    for module in modules:
+        for name, path in paths.items():
+            if hasattr(module, name):
+                setattr(module, name, path)
+
+    return paths
+
+
+def _seed_master(paths: dict[str, Path]) -> None:
+    pd.DataFrame([{"client_code": "C001", "client_name": "Test Pte Ltd"}]).to_excel(
+        paths["CLIENT_MASTER_FILE"], index=False
+    )
+    pd.DataFrame(
+        [{"item_code": "00015", "item_description": "Fire Rated Pyran S 6mm"}]
+    ).to_excel(paths["ITEM_MASTER_FILE"], index=False)
+
+
+def _create(po: str) -> str:
+    payload = {
+        "client_code": "C001",
+        "client_po_list": [po],
+        "items": [{"item_code": "00015", "qty": 2}],
+        "required_date": "2999-12-31",
+        "local_export": "Local",
+    }
+    return order_service.create_order_draft(payload)["jo_number"]
+
+
+def test_archive_moves_closed_orders_and_reads_fall_through(tmp_path: Path) -> None:
+    paths = _setup_paths(tmp_path)
+    _seed_master(paths)
+
+    open_jo = _create("PO-C")
+    completed = _create("PO-A")
+    do_number = order_service.confirm_order(completed)["do_client_number"]
+    order_status_service.complete_order(completed)
+    canceled = _create("PO-B")
+    order_status_service.cancel_order(canceled)
+    stats_before = stats_service.get_order_stats(rebuild=True)
+
+    assert archive_service.archive_orders(older_than_days=30) == {
+        "job_orders": 0,
+        "delivery_orders": 0,
+    }
+    tomorrow = date.today() + timedelta(days=1)
+    result = archive_service.archive_orders(older_than_days=0, today=tomorrow)
+    assert result == {"job_orders": 2, "delivery_orders": 1}
+
+    hot = pd.read_excel(paths["JOB_ORDER_FILE"], dtype=object)
+    assert list(hot["jo_number"]) == [open_jo]
+    assert pd.read_excel(paths["DELIVERY_ORDER_FILE"], dtype=object).empty
+    year = date.today().year
+    assert db.archive_years(paths["JOB_ORDER_FILE"]) == [year]
+
+    delivery = delivery_service.get_delivery_order(do_number)
+    assert delivery["client_po_list"] == ["PO-A"]
+    assert len(delivery["items"]) == 1
+
+    today = date.today()
+    rows = dashboard_service.list_orders({"year": today.year, "month": today.month})
+    assert sorted(row["jo_number"] for row in rows) == sorted(
+        [completed, canceled, open_jo]
+    )
+    assert [r["jo_number"] for r in search_service.search_orders("PO-B")] == [canceled]
+    assert stats_service.get_order_stats(rebuild=True) == stats_before
+
+    # Archived numbers are never handed out again.
+    assert _create("PO-D") not in (completed, canceled, open_jo)
@@ -3,9 +3,10 @@ from __future__ import annotations
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
 import db
-from services import order_service
+from services import archive_service, order_refs_service, order_service
 
 
 def _setup_paths(tmp_path: Path) -> dict[str, Path]:
@@ -19,6 +20,7 @@ def _setup_paths(tmp_path: Path) -> dict[str, Path]:
         "MASTER_DIR": master_dir,
         "JOB_ORDER_FILE": data_dir / "job_order.xlsx",
         "JOB_ORDER_ITEMS_FILE": data_dir / "job_order_items.xlsx",
+        "JOB_ORDER_REFS_FILE": data_dir / "job_order_refs.xlsx",
         "DELIVERY_ORDER_FILE": data_dir / "delivery_order.xlsx",
         "DELIVERY_ORDER_ITEMS_FILE": data_dir / "delivery_order_items.xlsx",
         "CLIENT_MASTER_FILE": master_dir / "client_master.xlsx",
@@ -29,6 +31,7 @@ def _setup_paths(tmp_path: Path) -> dict[str, Path]:
     db.MASTER_DIR = master_dir
     db.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
     db.JOB_ORDER_ITEMS_FILE = paths["JOB_ORDER_ITEMS_FILE"]
+    db.JOB_ORDER_REFS_FILE = paths["JOB_ORDER_REFS_FILE"]
     db.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
     db.DELIVERY_ORDER_ITEMS_FILE = paths["DELIVERY_ORDER_ITEMS_FILE"]
     db.CLIENT_MASTER_FILE = paths["CLIENT_MASTER_FILE"]
@@ -36,11 +39,25 @@ def _setup_paths(tmp_path: Path) -> dict[str, Path]:
 
     order_service.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
     order_service.JOB_ORDER_ITEMS_FILE = paths["JOB_ORDER_ITEMS_FILE"]
+    order_service.JOB_ORDER_REFS_FILE = paths["JOB_ORDER_REFS_FILE"]
     order_service.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
     order_service.DELIVERY_ORDER_ITEMS_FILE = paths["DELIVERY_ORDER_ITEMS_FILE"]
     order_service.CLIENT_MASTER_FILE = paths["CLIENT_MASTER_FILE"]
     order_service.ITEM_MASTER_FILE = paths["ITEM_MASTER_FILE"]
 
+    order_refs_service.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
+    order_refs_service.JOB_ORDER_REFS_FILE = paths["JOB_ORDER_REFS_FILE"]
+    order_refs_service.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
+
+    for name in (
+        "JOB_ORDER_FILE",
+        "JOB_ORDER_ITEMS_FILE",
+        "JOB_ORDER_REFS_FILE",
+        "DELIVERY_ORDER_FILE",
+        "DELIVERY_ORDER_ITEMS_FILE",
+    ):
+        setattr(archive_service, name, paths[name])
+
     return paths
 
 
@@ -91,3 +108,45 @@ def test_create_order_draft(tmp_path: Path) -> None:
     items_df = pd.read_excel(paths["JOB_ORDER_ITEMS_FILE"], dtype=object)
     assert len(items_df) == 1
     assert items_df.loc[0, "item_code"] == "00015"
+
+    assert "client_po_list" not in job_order_df.columns
+    assert result["client_po_list"] == ["PO-001", "PO-002"]
+    assert order_refs_service.find_orders_by_ref("po-002") == [result["jo_number"]]
+    refs = order_refs_service.refs_for(result["jo_number"])
+    assert refs[order_service.REF_SUPPLIER_DO] == ("DOS-001",)
+
+
+def test_create_order_draft_reports_every_bad_line(tmp_path: Path) -> None:
+    paths = _setup_paths(tmp_path)
+    _seed_master(paths)
+
+    payload = {
+        "client_code": "C001",
+        "items": [
+            {"item_code": "00015", "qty": 2},
+            {"item_code": "", "qty": "abc"},
+            {"item_code": "00015", "qty": 1, "width": "wide"},
+        ],
+        "required_date": "2026-02-05",
+        "local_export": "Local",
+    }
+    with pytest.raises(order_service.ValidationError) as excinfo:
+        order_service.create_order_draft(payload)
+    assert excinfo.value.errors == [
+        "Missing required field: items[2].item_code",
+        "items[2].qty must be a positive number",
+        "items[3].width must be a non-negative number",
+    ]
+    assert not paths["JOB_ORDER_FILE"].exists()
+
+    payload["items"] = [
+        {"item_code": "00015", "qty": 2},
+        {"item_code": "00099", "qty": 1, "item_description": "Custom cut"},
+        {"item_code": "00099", "qty": 1},
+    ]
+    result = order_service.create_order_draft(payload)
+    assert [i["item_description"] for i in result["items"]] == [
+        "Fire Rated Pyran S 6mm",
+        "Custom cut",
+        "",
+    ]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+import db
+
+
+def _seed_table(path: Path) -> None:
+    pd.DataFrame(
+        [
+            {"do_client_number": "DO26-001", "item_code": "A", "qty": 1},
+            {"do_client_number": "DO26-002", "item_code": "B", "qty": None},
+            {"do_client_number": "DO26-001", "item_code": "C", "qty": 3},
+        ]
+    ).to_excel(path, index=False)
+
+
+def test_iter_rows_projects_and_filters(tmp_path: Path) -> None:
+    path = tmp_path / "items.xlsx"
+    _seed_table(path)
+
+    rows = list(
+        db.iter_rows(
+            path,
+            columns=["item_code", "qty", "remark"],
+            where=lambda row: row["item_code"] != "B",
+        )
+    )
+
+    assert rows == [
+        {"item_code": "A", "qty": 1, "remark": ""},
+        {"item_code": "C", "qty": 3, "remark": ""},
+    ]
+
+
+def test_find_row_returns_first_match(tmp_path: Path) -> None:
+    path = tmp_path / "items.xlsx"
+    _seed_table(path)
+
+    row = db.find_row(path, lambda r: r["do_client_number"] == "DO26-001")
+    assert row is not None
+    assert row["item_code"] == "A"
+
+    assert db.find_row(path, lambda r: r["item_code"] == "Z") is None
+    assert db.find_row(tmp_path / "missing.xlsx", lambda r: True) is None
+
+
+def test_snapshot_restores_only_unchanged_sources(tmp_path: Path) -> None:
+    fresh = tmp_path / "fresh.xlsx"
+    stale = tmp_path / "stale.xlsx"
+    _seed_table(fresh)
+    _seed_table(stale)
+    snapshot = tmp_path / "snapshot.pickle"
+
+    db.invalidate()
+    db.cached("fresh", [fresh], lambda: "from disk")
+    db.cached("stale", [stale], lambda: "from disk")
+    # Concurrent writers (workers exiting together) each use their own temp file.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(lambda _: db.save_snapshot(snapshot), range(8))) == [2] * 8
+    assert not list(tmp_path.glob("*.tmp"))
+
+    db.invalidate()
+    pd.DataFrame([{"item_code": "Z"}]).to_excel(stale, index=False)
+    assert db.load_snapshot(snapshot) == 1
+    assert db.cached("fresh", [fresh], lambda: "rebuilt") == "from disk"
+    assert db.cached("stale", [stale], lambda: "rebuilt") == "rebuilt"
+
+    snapshot.write_bytes(b"not a pickle")
+    assert db.load_snapshot(snapshot) == 0
+    db.invalidate()
+
+
+def test_next_number_continues_past_999() -> None:
+    df = pd.DataFrame({"jo_number": ["JO26-998", "JO26-999", "JO26-1000", "JO25-4000"]})
+    assert db.next_number(df, "jo_number", "JO", "26") == "JO26-1001"
+    assert db.next_number(df.iloc[:2], "jo_number", "JO", "26") == "JO26-1000"
@@ -3,9 +3,16 @@ from __future__ import annotations
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
 import db
-from services import delivery_service, order_service
+from services import (
+    archive_service,
+    delivery_service,
+    order_refs_service,
+    order_service,
+    print_service,
+)
 
 
 def _setup_paths(tmp_path: Path) -> dict[str, Path]:
@@ -19,6 +26,7 @@ def _setup_paths(tmp_path: Path) -> dict[str, Path]:
         "MASTER_DIR": master_dir,
         "JOB_ORDER_FILE": data_dir / "job_order.xlsx",
         "JOB_ORDER_ITEMS_FILE": data_dir / "job_order_items.xlsx",
+        "JOB_ORDER_REFS_FILE": data_dir / "job_order_refs.xlsx",
         "DELIVERY_ORDER_FILE": data_dir / "delivery_order.xlsx",
         "DELIVERY_ORDER_ITEMS_FILE": data_dir / "delivery_order_items.xlsx",
         "CLIENT_MASTER_FILE": master_dir / "client_master.xlsx",
@@ -29,6 +37,7 @@ def _setup_paths(tmp_path: Path) -> dict[str, Path]:
     db.MASTER_DIR = master_dir
     db.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
     db.JOB_ORDER_ITEMS_FILE = paths["JOB_ORDER_ITEMS_FILE"]
+    db.JOB_ORDER_REFS_FILE = paths["JOB_ORDER_REFS_FILE"]
     db.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
     db.DELIVERY_ORDER_ITEMS_FILE = paths["DELIVERY_ORDER_ITEMS_FILE"]
     db.CLIENT_MASTER_FILE = paths["CLIENT_MASTER_FILE"]
@@ -36,6 +45,7 @@ def _setup_paths(tmp_path: Path) -> dict[str, Path]:
 
     order_service.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
     order_service.JOB_ORDER_ITEMS_FILE = paths["JOB_ORDER_ITEMS_FILE"]
+    order_service.JOB_ORDER_REFS_FILE = paths["JOB_ORDER_REFS_FILE"]
     order_service.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
     order_service.DELIVERY_ORDER_ITEMS_FILE = paths["DELIVERY_ORDER_ITEMS_FILE"]
     order_service.CLIENT_MASTER_FILE = paths["CLIENT_MASTER_FILE"]
@@ -44,6 +54,19 @@ def _setup_paths(tmp_path: Path) -> dict[str, Path]:
     delivery_service.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
     delivery_service.DELIVERY_ORDER_ITEMS_FILE = paths["DELIVERY_ORDER_ITEMS_FILE"]
 
+    order_refs_service.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
+    order_refs_service.JOB_ORDER_REFS_FILE = paths["JOB_ORDER_REFS_FILE"]
+    order_refs_service.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
+
+    for name in (
+        "JOB_ORDER_FILE",
+        "JOB_ORDER_ITEMS_FILE",
+        "JOB_ORDER_REFS_FILE",
+        "DELIVERY_ORDER_FILE",
+        "DELIVERY_ORDER_ITEMS_FILE",
+    ):
+        setattr(archive_service, name, paths[name])
+
     return paths
 
 
@@ -86,3 +109,50 @@ def test_confirm_and_get_delivery_order(tmp_path: Path) -> None:
     assert delivery["client_name"] == "Test Pte Ltd"
     assert delivery["delivery_address"] == "1, Raffles Mall"
     assert len(delivery["items"]) == 1
+
+
+def test_batch_delivery_orders_and_cached_print(tmp_path: Path) -> None:
+    paths = _setup_paths(tmp_path)
+    _seed_master(paths)
+
+    do_numbers = []
+    for qty in (1, 2, 3):
+        payload = {
+            "client_code": "C001",
+            "items": [{"item_code": "00015", "qty": qty}],
+            "required_date": "2026-02-05",
+            "local_export": "Local",
+        }
+        draft = order_service.create_order_draft(payload)
+        do_numbers.append(
+            order_service.confirm_order(draft["jo_number"])["do_client_number"]
+        )
+
+    batch = delivery_service.get_delivery_orders(do_numbers[::-1])
+    assert [d["do_client_number"] for d in batch] == do_numbers[::-1]
+    assert batch[-1] == delivery_service.get_delivery_order(do_numbers[0])
+    with pytest.raises(ValueError, match="DO26-999"):
+        delivery_service.get_delivery_orders([do_numbers[0], "DO26-999"])
+
+    rendered = []
+
+    def _render(do: dict) -> str:
+        rendered.append(do["do_client_number"])
+        return f"<p>{do['do_client_number']}:{do['items'][0]['qty']}</p>"
+
+    sheets, missing = print_service.render_delivery_orders(
+        do_numbers + ["DO26-999"], _render
+    )
+    assert missing == ["DO26-999"]
+    assert sheets == [f"<p>{n}:{q}</p>" for n, q in zip(do_numbers, (1, 2, 3))]
+
+    sheets_again, _ = print_service.render_delivery_orders(do_numbers, _render)
+    assert sheets_again == sheets
+    assert rendered == do_numbers
+
+    # Any edit to a DO bumps updated_at, so only that sheet is rendered again.
+    delivery_df = pd.read_excel(paths["DELIVERY_ORDER_FILE"], dtype=object)
+    delivery_df.loc[1, "updated_at"] = "2099-01-01T00:00:00"
+    delivery_df.to_excel(paths["DELIVERY_ORDER_FILE"], index=False)
+    print_service.render_delivery_orders(do_numbers, _render)
+    assert rendered == do_numbers + [do_numbers[1]]
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from flask import Flask, jsonify
+
+from idempotency import ResultCache, idempotent, init_idempotency
+
+
+def test_result_cache_expires_and_is_bounded() -> None:
+    now = [0.0]
+    cache = ResultCache(ttl=10, max_entries=2, clock=lambda: now[0])
+    cache.put("a", (200, b"a", "application/json"))
+    cache.put("b", (200, b"b", "application/json"))
+    cache.put("c", (200, b"c", "application/json"))
+    assert cache.get("a") is None
+    assert len(cache) == 2
+
+    now[0] = 10.0
+    assert cache.get("b") is None
+    cache.put("d", (200, b"d", "application/json"))
+    assert len(cache) == 1
+
+
+def _app() -> tuple[Flask, dict[str, int]]:
+    app = Flask(__name__)
+    init_idempotency(app)
+    calls = {"create": 0, "confirm": 0}
+    confirmed: set[str] = set()
+
+    @app.post("/orders")
+    @idempotent()
+    def create():
+        calls["create"] += 1
+        return jsonify({"ok": True, "data": calls["create"]})
+
+    @app.post("/orders/<jo_number>/confirm")
+    @idempotent(
+        natural_key=lambda jo_number: jo_number if jo_number in confirmed else None
+    )
+    def confirm(jo_number: str):
+        if jo_number in confirmed:
+            return jsonify({"ok": False, "error": "already confirmed"}), 400
+        calls["confirm"] += 1
+        confirmed.add(jo_number)
+        return jsonify({"ok": True, "data": jo_number})
+
+    return app, calls
+
+
+def test_repeated_key_replays_stored_response() -> None:
+    app, calls = _app()
+    client = app.test_client()
+
+    first = client.post("/orders", headers={"Idempotency-Key": "k1"})
+    again = client.post("/orders", headers={"Idempotency-Key": "k1"})
+    other = client.post("/orders", headers={"Idempotency-Key": "k2"})
+    assert first.get_json() == again.get_json() == {"ok": True, "data": 1}
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert other.get_json()["data"] == 2
+    client.post("/orders")
+    client.post("/orders")
+    assert calls["create"] == 4
+
+    reused = client.post("/orders", headers={"Idempotency-Key": "k1"}, json={"x": 1})
+    assert reused.status_code == 422
+    assert calls["create"] == 4
+
+
+def test_natural_key_replays_without_header() -> None:
+    app, calls = _app()
+    client = app.test_client()
+
+    first = client.post("/orders/JO26-001/confirm")
+    again = client.post("/orders/JO26-001/confirm")
+    assert again.status_code == 200
+    assert again.get_json() == first.get_json()
+    assert calls["confirm"] == 1
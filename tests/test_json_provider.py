@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import gzip
+import json
+
+import numpy as np
+from flask import Flask, jsonify
+
+import json_provider
+from compression import init_compression
+from json_provider import FastJSONProvider
+
+
+def _app() -> Flask:
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config["COMPRESS_MIN_SIZE"] = 1024
+    init_compression(app)
+
+    @app.get("/rows/<int:count>")
+    def rows(count: int):
+        return jsonify(
+            [{"qty": np.int64(i), "width": float("nan")} for i in range(count)]
+        )
+
+    return app
+
+
+def test_encode_handles_numpy_and_nan(monkeypatch) -> None:
+    payload = {"qty": np.int64(3), "width": np.float64("nan"), "tags": ("a",)}
+    expected = {"qty": 3, "width": None, "tags": ["a"]}
+    assert json.loads(json_provider.encode(payload)) == expected
+
+    monkeypatch.setattr(json_provider, "orjson", None)
+    assert json.loads(json_provider.encode(payload)) == expected
+
+
+def test_large_responses_are_gzipped() -> None:
+    client = _app().test_client()
+
+    small = client.get("/rows/2", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    assert small.get_json()[1] == {"qty": 1, "width": None}
+
+    large = client.get("/rows/500", headers={"Accept-Encoding": "gzip"})
+    assert large.headers["Content-Encoding"] == "gzip"
+    assert len(json.loads(gzip.decompress(large.data))) == 500
+
+    plain = client.get("/rows/500")
+    assert "Content-Encoding" not in plain.headers
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import db
+from services import (
+    archive_service,
+    order_query_service,
+    order_refs_service,
+    order_service,
+    order_status_service,
+)
+
+
+def _setup_paths(tmp_path: Path) -> dict[str, Path]:
+    data_dir = tmp_path / "data"
+    master_dir = tmp_path / "master"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    master_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = {
+        "DATA_DIR": data_dir,
+        "MASTER_DIR": master_dir,
+        "JOB_ORDER_FILE": data_dir / "job_order.xlsx",
+        "JOB_ORDER_ITEMS_FILE": data_dir / "job_order_items.xlsx",
+        "JOB_ORDER_REFS_FILE": data_dir / "job_order_refs.xlsx",
+        "DELIVERY_ORDER_FILE": data_dir / "delivery_order.xlsx",
+        "DELIVERY_ORDER_ITEMS_FILE": data_dir / "delivery_order_items.xlsx",
+        "CLIENT_MASTER_FILE": master_dir / "client_master.xlsx",
+        "ITEM_MASTER_FILE": master_dir / "item_master.xlsx",
+    }
+
+    modules = (
+        db,
+        order_service,
+        order_status_service,
+        order_refs_service,
+        archive_service,
+        order_query_service,
+    )
+    for module in modules:
+        for name, path in paths.items():
+            if hasattr(module, name):
+                setattr(module, name, path)
+
+    return paths
+
+
+def _seed_master(paths: dict[str, Path]) -> None:
+    pd.DataFrame(
+        [
+            {"client_code": "C001", "client_name": "Test Pte Ltd"},
+            {"client_code": "C002", "client_name": "Other Pte Ltd"},
+        ]
+    ).to_excel(paths["CLIENT_MASTER_FILE"], index=False)
+    pd.DataFrame(
+        [{"item_code": "00015", "item_description": "Fire Rated Pyran S 6mm"}]
+    ).to_excel(paths["ITEM_MASTER_FILE"], index=False)
+
+
+def _create(client_code: str, required: date, local_export: str = "Local") -> str:
+    payload = {
+        "client_code": client_code,
+        "client_po_list": ["PO-1"],
+        "items": [{"item_code": "00015", "qty": 2}],
+        "required_date": required.isoformat(),
+        "local_export": local_export,
+    }
+    return order_service.create_order_draft(payload)["jo_number"]
+
+
+def _query(filters: dict, **kwargs) -> tuple[list[str], str]:
+    rows, plan = order_query_service.query_orders(filters, **kwargs)
+    return [row["jo_number"] for row in rows], plan
+
+
+def test_query_plans_and_filters(tmp_path: Path) -> None:
+    paths = _setup_paths(tmp_path)
+    _seed_master(paths)
+
+    today = date.today()
+    late = _create("C001", today + timedelta(days=2))
+    on_time = _create("C001", today + timedelta(days=20), "Export")
+    other = _create("C002", today + timedelta(days=2))
+    order_service.confirm_order(other)
+    done = _create("C002", today + timedelta(days=2))
+    order_service.confirm_order(done)
+    order_status_service.complete_order(done)
+
+    in_five_days = today + timedelta(days=5)
+    assert _query({"overdue": "1"}, today=in_five_days) == (
+        [late, other],
+        "scan -> 4; filter overdue -> 2",
+    )
+    assert _query({"client_code": "C001", "overdue": "1"}, today=in_five_days) == (
+        [late],
+        "index client_code -> 2; filter overdue -> 1",
+    )
+    ids, plan = _query(
+        {
+            "status": ["Preparing", "Delivering"],
+            "client_code": "C002",
+            "issue_from": today.isoformat(),
+        }
+    )
+    assert ids == [other]
+    assert plan == "index client_code -> 2; filter status, issue_date -> 1"
+    assert _query({"required_to": (today + timedelta(days=10)).isoformat()})[0] == [
+        late,
+        other,
+        done,
+    ]
+    assert _query({"local_export": "export"})[0] == [on_time]
+    # Issue and required ranges together, with client_code driving the plan.
+    assert _query(
+        {
+            "client_code": "C001",
+            "issue_from": today.isoformat(),
+            "issue_to": today.isoformat(),
+            "required_from": (today + timedelta(days=15)).isoformat(),
+            "required_to": (today + timedelta(days=25)).isoformat(),
+        }
+    ) == (
+        [on_time],
+        "index client_code -> 2; filter issue_date, required_date -> 1",
+    )
+    assert _query({"issue_to": (today - timedelta(days=1)).isoformat()}) == (
+        [],
+        "index issue_date -> 0",
+    )
+    # Filter values never reach the plan, which is sent as a response header.
+    assert _query({"client_code": "C001\r\nX-Evil: 1", "local_export": "ü"}) == (
+        [],
+        "index client_code -> 0; filter local_export -> 0",
+    )
+
+    # Writes mark the index stale; the next query sees them, archives included.
+    order_status_service.cancel_order(late)
+    tomorrow = today + timedelta(days=1)
+    archive_service.archive_orders(older_than_days=0, today=tomorrow)
+    assert _query({"status": "Canceled,Completed"})[0] == [late, done]
+
+    with pytest.raises(ValueError):
+        order_query_service.query_orders({"issue_from": "31/12/2025"})
+    with pytest.raises(ValueError):
+        order_query_service.query_orders({"status": "Shipped"})
+    with pytest.raises(ValueError):
+        order_query_service.query_orders(limit=-1)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+import db
+from services import (
+    dashboard_service,
+    order_refs_service,
+    order_service,
+    order_status_service,
+)
+
+
+def _setup_paths(tmp_path: Path) -> dict[str, Path]:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = {
+        "JOB_ORDER_FILE": data_dir / "job_order.xlsx",
+        "JOB_ORDER_REFS_FILE": data_dir / "job_order_refs.xlsx",
+        "DELIVERY_ORDER_FILE": data_dir / "delivery_order.xlsx",
+    }
+
+    db.DATA_DIR = data_dir
+    db.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
+    db.JOB_ORDER_REFS_FILE = paths["JOB_ORDER_REFS_FILE"]
+    db.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
+
+    order_refs_service.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
+    order_refs_service.JOB_ORDER_REFS_FILE = paths["JOB_ORDER_REFS_FILE"]
+    order_refs_service.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
+
+    return paths
+
+
+def _seed_legacy(paths: dict[str, Path]) -> None:
+    pd.DataFrame(
+        [
+            {
+                "jo_number": "JO26-001",
+                "issue_date": "2026-02-05",
+                "client_po_list": '["PO012345", "PO012346"]',
+                "do_to_supplier_list": "[]",
+                "status": "Completed",
+            },
+            {
+                "jo_number": "JO26-002",
+                "issue_date": "2026-02-06",
+                "client_po_list": '["PO012346"]',
+                "do_to_supplier_list": '["SUP-9"]',
+                "status": "Preparing",
+            },
+        ]
+    ).to_excel(paths["JOB_ORDER_FILE"], index=False)
+    pd.DataFrame(
+        [{"do_client_number": "DO26-001", "client_po_list": '["PO012345"]'}]
+    ).to_excel(paths["DELIVERY_ORDER_FILE"], index=False)
+
+
+def test_migrate_list_fields(tmp_path: Path) -> None:
+    paths = _setup_paths(tmp_path)
+    _seed_legacy(paths)
+
+    result = order_refs_service.migrate_list_fields()
+    assert result == {"job_orders": 2, "refs": 4}
+    assert order_refs_service.migrate_list_fields() == {"job_orders": 0, "refs": 0}
+
+    assert "client_po_list" not in db.read_header(paths["JOB_ORDER_FILE"])
+    assert "client_po_list" not in db.read_header(paths["DELIVERY_ORDER_FILE"])
+
+    assert order_refs_service.find_orders_by_ref("PO012346") == ["JO26-001", "JO26-002"]
+    assert order_refs_service.find_orders_by_ref(
+        "sup-9", order_service.REF_SUPPLIER_DO
+    ) == ["JO26-002"]
+
+    rows = dashboard_service.list_orders({"year": 2026, "month": 2})
+    assert [row["client_po_list"] for row in rows] == ["PO012345, PO012346", "PO012346"]
+    assert rows[1]["do_to_supplier_first"] == "SUP-9"
+
+
+def test_writes_before_migration_keep_legacy_lists(tmp_path: Path, monkeypatch) -> None:
+    paths = _setup_paths(tmp_path)
+    _seed_legacy(paths)
+    master_dir = tmp_path / "master"
+    master_dir.mkdir()
+    pd.DataFrame([{"client_code": "C001", "client_name": "Test Pte Ltd"}]).to_excel(
+        master_dir / "client_master.xlsx", index=False
+    )
+    pd.DataFrame([{"item_code": "00015", "item_description": "Pyran S"}]).to_excel(
+        master_dir / "item_master.xlsx", index=False
+    )
+    patched = {
+        "JOB_ORDER_FILE": paths["JOB_ORDER_FILE"],
+        "JOB_ORDER_ITEMS_FILE": tmp_path / "data" / "job_order_items.xlsx",
+        "JOB_ORDER_REFS_FILE": paths["JOB_ORDER_REFS_FILE"],
+        "DELIVERY_ORDER_FILE": paths["DELIVERY_ORDER_FILE"],
+        "CLIENT_MASTER_FILE": master_dir / "client_master.xlsx",
+        "ITEM_MASTER_FILE": master_dir / "item_master.xlsx",
+    }
+    for module in (order_service, order_status_service):
+        for name, path in patched.items():
+            if hasattr(module, name):
+                monkeypatch.setattr(module, name, path)
+
+    created = order_service.create_order_draft(
+        {
+            "client_code": "C001",
+            "client_po_list": ["PO-NEW"],
+            "items": [{"item_code": "00015", "qty": 1}],
+            "required_date": "2999-12-31",
+            "local_export": "Local",
+        }
+    )["jo_number"]
+    order_status_service.cancel_order("JO26-002")
+    assert order_refs_service.pending_list_migration() == [
+        "job_order.xlsx",
+        "delivery_order.xlsx",
+    ]
+
+    assert order_refs_service.migrate_list_fields() == {"job_orders": 2, "refs": 4}
+    assert order_refs_service.find_orders_by_ref("PO012346") == ["JO26-001", "JO26-002"]
+    assert order_refs_service.find_orders_by_ref("PO-NEW") == [created]
@@ -5,7 +5,12 @@ from pathlib import Path
 import pandas as pd
 
 import db
-from services import order_service, order_status_service
+from services import (
+    archive_service,
+    order_refs_service,
+    order_service,
+    order_status_service,
+)
 
 
 def _setup_paths(tmp_path: Path) -> dict[str, Path]:
@@ -19,6 +24,7 @@ def _setup_paths(tmp_path: Path) -> dict[str, Path]:
         "MASTER_DIR": master_dir,
         "JOB_ORDER_FILE": data_dir / "job_order.xlsx",
         "JOB_ORDER_ITEMS_FILE": data_dir / "job_order_items.xlsx",
+        "JOB_ORDER_REFS_FILE": data_dir / "job_order_refs.xlsx",
         "DELIVERY_ORDER_FILE": data_dir / "delivery_order.xlsx",
         "DELIVERY_ORDER_ITEMS_FILE": data_dir / "delivery_order_items.xlsx",
         "CLIENT_MASTER_FILE": master_dir / "client_master.xlsx",
@@ -29,6 +35,7 @@ def _setup_paths(tmp_path: Path) -> dict[str, Path]:
     db.MASTER_DIR = master_dir
     db.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
     db.JOB_ORDER_ITEMS_FILE = paths["JOB_ORDER_ITEMS_FILE"]
+    db.JOB_ORDER_REFS_FILE = paths["JOB_ORDER_REFS_FILE"]
     db.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
     db.DELIVERY_ORDER_ITEMS_FILE = paths["DELIVERY_ORDER_ITEMS_FILE"]
     db.CLIENT_MASTER_FILE = paths["CLIENT_MASTER_FILE"]
@@ -36,6 +43,7 @@ def _setup_paths(tmp_path: Path) -> dict[str, Path]:
 
     order_service.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
     order_service.JOB_ORDER_ITEMS_FILE = paths["JOB_ORDER_ITEMS_FILE"]
+    order_service.JOB_ORDER_REFS_FILE = paths["JOB_ORDER_REFS_FILE"]
     order_service.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
     order_service.DELIVERY_ORDER_ITEMS_FILE = paths["DELIVERY_ORDER_ITEMS_FILE"]
     order_service.CLIENT_MASTER_FILE = paths["CLIENT_MASTER_FILE"]
@@ -44,6 +52,19 @@ def _setup_paths(tmp_path: Path) -> dict[str, Path]:
     order_status_service.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
     order_status_service.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
 
+    order_refs_service.JOB_ORDER_FILE = paths["JOB_ORDER_FILE"]
+    order_refs_service.JOB_ORDER_REFS_FILE = paths["JOB_ORDER_REFS_FILE"]
+    order_refs_service.DELIVERY_ORDER_FILE = paths["DELIVERY_ORDER_FILE"]
+
+    for name in (
+        "JOB_ORDER_FILE",
+        "JOB_ORDER_ITEMS_FILE",
+        "JOB_ORDER_REFS_FILE",
+        "DELIVERY_ORDER_FILE",
+        "DELIVERY_ORDER_ITEMS_FILE",
+    ):
+        setattr(archive_service, name, paths[name])
+
     return paths
 
 
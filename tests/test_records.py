@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+from dataclasses import fields
+
+from records import DeliveryOrder, DeliveryOrderItem, JobOrder, Status, clean
+from services.order_service import DELIVERY_ORDER_COLUMNS
+
+
+def test_job_order_from_storage_row() -> None:
+    order = JobOrder.from_row(
+        {
+            "jo_number": "JO26-001",
+            "client_po_list": '["PO-001", "PO-002"]',
+            "do_to_supplier_list": "[]",
+            "status": "Delivering",
+            "remark": float("nan"),
+        }
+    )
+
+    assert order.client_po_list == ("PO-001", "PO-002")
+    assert order.do_to_supplier_list == ()
+    assert order.status is Status.DELIVERING
+    assert order.remark == ""
+    assert not hasattr(order, "__dict__")
+
+    data = json.loads(json.dumps(order.to_dict()))
+    assert data["status"] == "Delivering"
+    assert data["client_po_list"] == ["PO-001", "PO-002"]
+
+
+def test_item_keeps_numeric_cells() -> None:
+    item = DeliveryOrderItem.from_row({"item_code": "00015", "qty": 10, "width": None})
+    assert item.qty == 10
+    assert item.width == ""
+    assert clean(float("nan")) == ""
+
+
+def test_delivery_order_matches_its_table() -> None:
+    assert [f.name for f in fields(DeliveryOrder)] == DELIVERY_ORDER_COLUMNS
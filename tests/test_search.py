@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+import db
+from services import (
+    archive_service,
+    order_refs_service,
+    order_service,
+    search_service,
+)
+
+
+def _setup_paths(tmp_path: Path) -> dict[str, Path]:
+    data_dir = tmp_path / "data"
+    master_dir = tmp_path / "master"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    master_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = {
+        "DATA_DIR": data_dir,
+        "MASTER_DIR": master_dir,
+        "JOB_ORDER_FILE": data_dir / "job_order.xlsx",
+        "JOB_ORDER_ITEMS_FILE": data_dir / "job_order_items.xlsx",
+        "JOB_ORDER_REFS_FILE": data_dir / "job_order_refs.xlsx",
+        "DELIVERY_ORDER_FILE": data_dir / "delivery_order.xlsx",
+        "DELIVERY_ORDER_ITEMS_FILE": data_dir / "delivery_order_items.xlsx",
+        "CLIENT_MASTER_FILE": master_dir / "client_master.xlsx",
+        "ITEM_MASTER_FILE": master_dir / "item_master.xlsx",
+    }
+
+    for module in (
+        db,
+        order_service,
+        order_refs_service,
+        archive_service,
+        search_service,
+    ):
+        for name, path in paths.items():
+            if hasattr(module, name):
+                setattr(module, name, path)
+
+    return paths
+
+
+def _seed_master(paths: dict[str, Path]) -> None:
+    pd.DataFrame(
+        [
+            {"client_code": "C001", "client_name": "Test Pte Ltd"},
+            {"client_code": "C002", "client_name": "Harbour Glass"},
+        ]
+    ).to_excel(paths["CLIENT_MASTER_FILE"], index=False)
+    pd.DataFrame(
+        [{"item_code": "00015", "item_description": "Fire Rated Pyran S 6mm"}]
+    ).to_excel(paths["ITEM_MASTER_FILE"], index=False)
+
+
+def _create(client_code: str, po: str, item_code: str) -> str:
+    payload = {
+        "client_code": client_code,
+        "client_po_list": [po],
+        "do_to_supplier_list": ["SUP-DO-7"],
+        "items": [{"item_code": item_code, "qty": 1}],
+        "required_date": "2026-02-05",
+        "local_export": "Local",
+    }
+    return order_service.create_order_draft(payload)["jo_number"]
+
+
+def test_search_orders(tmp_path: Path) -> None:
+    paths = _setup_paths(tmp_path)
+    _seed_master(paths)
+
+    first = _create("C001", "PO-7781", "00015")
+    second = _create("C002", "PO-7790", "WIRED")
+
+    assert [r["jo_number"] for r in search_service.search_orders("po-7781")] == [first]
+    assert [r["jo_number"] for r in search_service.search_orders("harbour")] == [second]
+    assert [r["jo_number"] for r in search_service.search_orders("wired")] == [second]
+    assert len(search_service.search_orders("PO-77")) == 2
+    assert search_service.search_orders("harbour 00015") == []
+
+    index = search_service.load_search_index()
+    confirm = order_service.confirm_order(first)
+    hits = search_service.search_orders(confirm["do_client_number"])
+    assert hits[0]["jo_number"] == first
+    assert hits[0]["status"] == "Delivering"
+    # The confirm was applied to the live index rather than forcing a rebuild.
+    assert search_service.load_search_index() is index
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+import db
+from services import (
+    archive_service,
+    order_refs_service,
+    order_service,
+    order_status_service,
+    stats_service,
+)
+
+
+def _setup_paths(tmp_path: Path) -> dict[str, Path]:
+    data_dir = tmp_path / "data"
+    master_dir = tmp_path / "master"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    master_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = {
+        "DATA_DIR": data_dir,
+        "MASTER_DIR": master_dir,
+        "JOB_ORDER_FILE": data_dir / "job_order.xlsx",
+        "JOB_ORDER_ITEMS_FILE": data_dir / "job_order_items.xlsx",
+        "JOB_ORDER_REFS_FILE": data_dir / "job_order_refs.xlsx",
+        "DELIVERY_ORDER_FILE": data_dir / "delivery_order.xlsx",
+        "DELIVERY_ORDER_ITEMS_FILE": data_dir / "delivery_order_items.xlsx",
+        "CLIENT_MASTER_FILE": master_dir / "client_master.xlsx",
+        "ITEM_MASTER_FILE": master_dir / "item_master.xlsx",
+    }
+
+    modules = (
+        db,
+        order_service,
+        order_status_service,
+        order_refs_service,
+        archive_service,
+        stats_service,
+    )
+    for module in modules:
+        for name, path in paths.items():
+            if hasattr(module, name):
+                setattr(module, name, path)
+
+    return paths
+
+
+def _seed_master(paths: dict[str, Path]) -> None:
+    pd.DataFrame([{"client_code": "C001", "client_name": "Test Pte Ltd"}]).to_excel(
+        paths["CLIENT_MASTER_FILE"], index=False
+    )
+    pd.DataFrame(
+        [{"item_code": "00015", "item_description": "Fire Rated Pyran S 6mm"}]
+    ).to_excel(paths["ITEM_MASTER_FILE"], index=False)
+
+
+def _create(qty: int, required_date: str) -> str:
+    payload = {
+        "client_code": "C001",
+        "items": [{"item_code": "00015", "qty": qty}],
+        "required_date": required_date,
+        "local_export": "Local",
+    }
+    return order_service.create_order_draft(payload)["jo_number"]
+
+
+def test_stats_follow_order_lifecycle(tmp_path: Path) -> None:
+    paths = _setup_paths(tmp_path)
+    _seed_master(paths)
+
+    on_time = _create(10, "2999-12-31")
+    late = _create(4, "2000-01-01")
+    _create(3, "2999-12-31")
+    assert stats_service.get_order_stats()["by_status"] == {"Preparing": 3}
+
+    order_service.confirm_order(on_time)
+    order_service.confirm_order(late)
+    order_status_service.complete_order(on_time)
+    order_status_service.complete_order(late)
+    order_status_service.cancel_order(_create(5, "2999-12-31"))
+
+    stats = stats_service.get_order_stats()
+    assert stats["total"] == 4
+    assert stats["by_status"] == {"Completed": 2, "Preparing": 1, "Canceled": 1}
+    assert stats["deliveries"] == {"on_time": 1, "late": 1, "on_time_rate": 0.5}
+    month = db.today_date()[:7]
+    assert stats["open_qty"] == [{"client_code": "C001", "month": month, "qty": 3.0}]
+
+    assert stats_service.get_order_stats(rebuild=True) == stats
+
+
+def test_replayed_updates_do_not_count_twice() -> None:
+    stats = stats_service.OrderStats()
+    for _ in range(2):
+        stats.add("JO26-001", "Preparing", "C001", "2026-01-05", "2026-01-20", 4.0)
+    stats.add("JO26-002", "Delivering", "C001", "2026-01-06", "2026-01-20", 6.0)
+    for _ in range(2):
+        stats.move("JO26-002", "Completed", "2026-01-19")
+
+    summary = stats.summary()
+    assert summary["total"] == 2
+    assert summary["by_status"] == {"Preparing": 1, "Completed": 1}
+    assert summary["deliveries"]["on_time"] == 1
+    assert summary["open_qty"] == [
+        {"client_code": "C001", "month": "2026-01", "qty": 4.0}
+    ]
+
+
+def test_reads_during_a_write_see_it_whole_or_not_at_all(
+    tmp_path: Path, monkeypatch
+) -> None:
+    paths = _setup_paths(tmp_path)
+    _seed_master(paths)
+    _create(5, "2999-12-31")
+    before = stats_service.get_order_stats()
+    order_refs_service.find_orders_by_ref("PX2")
+
+    # Hold the write between its workbook writes and its publish().
+    in_window, release = threading.Event(), threading.Event()
+    publish = order_service.publish
+
+    def _paused_publish(event: str, **payload) -> None:
+        in_window.set()
+        release.wait(5)
+        publish(event, **payload)
+
+    monkeypatch.setattr(order_service, "publish", _paused_publish)
+    created: list[str] = []
+
+    def _write() -> None:
+        payload = {
+            "client_code": "C001",
+            "client_po_list": ["PX2"],
+            "items": [{"item_code": "00015", "qty": 10}],
+            "required_date": "2999-12-31",
+            "local_export": "Local",
+        }
+        created.append(order_service.create_order_draft(payload)["jo_number"])
+
+    writer = threading.Thread(target=_write)
+    writer.start()
+    try:
+        assert in_window.wait(5)
+        # Readers neither wait for the write nor rebuild from its half-done
+        # tables: they see the indexes as they were before it.
+        assert stats_service.get_order_stats() == before
+        assert order_refs_service.find_orders_by_ref("PX2") == []
+    finally:
+        release.set()
+        writer.join(5)
+
+    stats = stats_service.get_order_stats()
+    assert stats["total"] == 2
+    assert stats["by_status"] == {"Preparing": 2}
+    assert stats == stats_service.get_order_stats(rebuild=True)
+    assert order_refs_service.find_orders_by_ref("PX2") == created
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import db
+from services import (
+    archive_service,
+    order_refs_service,
+    order_service,
+    supplier_service,
+)
+
+
+def _setup_paths(tmp_path: Path) -> dict[str, Path]:
+    data_dir = tmp_path / "data"
+    master_dir = tmp_path / "master"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    master_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = {
+        "DATA_DIR": data_dir,
+        "MASTER_DIR": master_dir,
+        "JOB_ORDER_FILE": data_dir / "job_order.xlsx",
+        "JOB_ORDER_ITEMS_FILE": data_dir / "job_order_items.xlsx",
+        "JOB_ORDER_REFS_FILE": data_dir / "job_order_refs.xlsx",
+        "DELIVERY_ORDER_FILE": data_dir / "delivery_order.xlsx",
+        "DELIVERY_ORDER_ITEMS_FILE": data_dir / "delivery_order_items.xlsx",
+        "SUPPLIER_PO_FILE": data_dir / "supplier_po.xlsx",
+        "SUPPLIER_PO_ITEMS_FILE": data_dir / "supplier_po_items.xlsx",
+        "CLIENT_MASTER_FILE": master_dir / "client_master.xlsx",
+        "ITEM_MASTER_FILE": master_dir / "item_master.xlsx",
+        "SUPPLIER_MASTER_FILE": master_dir / "supplier_master.xlsx",
+    }
+
+    modules = (db, order_service, order_refs_service, archive_service, supplier_service)
+    for module in modules:
+        for name, path in paths.items():
+            if hasattr(module, name):
+                setattr(module, name, path)
+
+    return paths
+
+
+def _seed_master(paths: dict[str, Path]) -> None:
+    pd.DataFrame([{"client_code": "C001", "client_name": "Test Pte Ltd"}]).to_excel(
+        paths["CLIENT_MASTER_FILE"], index=False
+    )
+    pd.DataFrame(
+        [{"item_code": "00015", "item_description": "Fire Rated Pyran S 6mm"}]
+    ).to_excel(paths["ITEM_MASTER_FILE"], index=False)
+    pd.DataFrame([{"supplier_code": "GLX", "supplier_name": "Glimex"}]).to_excel(
+        paths["SUPPLIER_MASTER_FILE"], index=False
+    )
+
+
+def _create_jo() -> str:
+    payload = {
+        "client_code": "C001",
+        "items": [{"item_code": "00015", "qty": 10}],
+        "required_date": "2026-02-01",
+        "local_export": "Local",
+    }
+    return order_service.create_order_draft(payload)["jo_number"]
+
+
+def test_supplier_po_create_link_receive(tmp_path: Path) -> None:
+    paths = _setup_paths(tmp_path)
+    _seed_master(paths)
+    jo_number = _create_jo()
+
+    assert supplier_service.get_supplier("GLX")["supplier_name"] == "Glimex"
+    with pytest.raises(ValueError):
+        supplier_service.create_supplier_po(
+            {"supplier_code": "NOPE", "items": [{"item_code": "00015", "qty": 1}]}
+        )
+
+    for bad in ({"item_code": "00015", "qty": -3}, {"item_code": "00015", "qty": 0}):
+        with pytest.raises(ValueError):
+            supplier_service.create_supplier_po(
+                {"supplier_code": "GLX", "items": [bad]}
+            )
+
+    po = supplier_service.create_supplier_po(
+        {
+            "supplier_code": "GLX",
+            "items": [
+                {"item_code": "00015", "qty": 10},
+                {"item_code": "00020", "qty": 4},
+            ],
+        }
+    )
+    po_no = po["supplier_po_no"]
+    assert po_no.startswith("SPO")
+    assert po["po_status"] == "OPEN"
+    assert len(po["items"]) == 2
+    assert supplier_service.list_supplier_pos_for_order(jo_number) == []
+
+    supplier_service.link_supplier_po(po_no, jo_number)
+    linked = supplier_service.list_supplier_pos_for_order(jo_number)
+    assert [p["supplier_po_no"] for p in linked] == [po_no]
+    assert {i["order_id"] for i in linked[0]["items"]} == {jo_number}
+    with pytest.raises(ValueError):
+        supplier_service.link_supplier_po(po_no, "JO99-999")
+
+    nothing = supplier_service.receive_supplier_po(
+        po_no, [{"item_code": "00015", "qty": 0}]
+    )
+    assert nothing["po_status"] == "OPEN"
+    assert nothing["received_date"] == ""
+    partial = supplier_service.receive_supplier_po(
+        po_no, [{"item_code": "00015", "qty": 6}]
+    )
+    assert partial["po_status"] == "PARTIAL"
+    for bad in ([{"item_code": "00015", "qty": -5}], {"item_code": "00015"}, ["x"]):
+        with pytest.raises(ValueError):
+            supplier_service.receive_supplier_po(po_no, bad)
+    with pytest.raises(ValueError):
+        supplier_service.receive_supplier_po(po_no, [{"item_code": "00015", "qty": 5}])
+
+    received = supplier_service.receive_supplier_po(po_no)
+    assert received["po_status"] == "RECEIVED"
+    assert [i["received_qty"] for i in received["items"]] == [10, 4]
+
+    # The patched index matches a rebuild from storage.
+    db.invalidate(name="supplier_pos")
+    assert supplier_service.get_supplier_po(po_no) == received
+    stored = pd.read_excel(paths["SUPPLIER_PO_FILE"])
+    assert stored.loc[0, "order_id"] == jo_number
+    items = pd.read_excel(paths["SUPPLIER_PO_ITEMS_FILE"])
+    assert stored.loc[0, "po_id"] == f"spo-{po_no}"
+    assert list(items["po_id"]) == [f"spo-{po_no}"] * 2
+    assert items.loc[0, "po_item_id"] == f"spo-{po_no}-item-1"
+
+    # Numbering follows the index, so the next PO continues the sequence.
+    follow_up = supplier_service.create_supplier_po(
+        {"supplier_code": "GLX", "items": [{"item_code": "00015", "qty": 1}]}
+    )
+    prefix, seq = po_no.rsplit("-", 1)
+    assert follow_up["supplier_po_no"] == f"{prefix}-{int(seq) + 1:03d}"